@@ -7,6 +7,10 @@
 echo "Applying migrations..."
 python libertypost/manage.py migrate
 
+# Перерисовка HTML статей, если изменилось содержимое или конфигурация Markdown
+echo "Rendering articles..."
+python libertypost/manage.py render_articles
+
 # Сборка статических файлов с подробным выводом
 echo "Collecting static files..."
 python libertypost/manage.py collectstatic --noinput --verbosity 2
@@ -25,6 +29,19 @@ else:
     print('Superuser already exists.')
 "
 
-# Запуск Gunicorn
+# Запуск Gunicorn: SERVER_INTERFACE=asgi запускает воркеры Uvicorn,
+# в которых асинхронные представления обслуживают много запросов одновременно.
+# Каждый воркер держит свои соединения с базой данных (DB_CONN_MAX_AGE / DB_POOL),
+# всего их не больше GUNICORN_WORKERS * DB_POOL_MAX_SIZE
+GUNICORN_WORKERS=${GUNICORN_WORKERS:-3}
+
+if [ "$SERVER_INTERFACE" = "asgi" ]; then
+    echo "Starting Gunicorn (ASGI, Uvicorn workers)..."
+    exec gunicorn --chdir libertypost --bind 0.0.0.0:8000 \
+        --workers "$GUNICORN_WORKERS" \
+        --worker-class uvicorn.workers.UvicornWorker libertypost.asgi:application
+fi
+
 echo "Starting Gunicorn..."
-exec gunicorn --chdir libertypost --bind 0.0.0.0:8000 libertypost.wsgi:application
+exec gunicorn --chdir libertypost --bind 0.0.0.0:8000 \
+    --workers "$GUNICORN_WORKERS" libertypost.wsgi:application
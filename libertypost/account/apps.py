@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AccountConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'account'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .avatars import avatar_registry
+
+        # Список аватарок читается при запуске, а не при создании первого пользователя
+        avatar_registry.scan()
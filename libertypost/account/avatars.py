@@ -0,0 +1,103 @@
+"""
+Список аватарок по умолчанию из MEDIA_ROOT/avatars.
+
+Аватарка по умолчанию выбирается при создании каждого объекта User
+(регистрация, createsuperuser, фикстуры, массовый импорт), поэтому каталог
+не читается при каждом вызове: список сканируется один раз и хранится в памяти
+процесса. Время изменения каталога проверяется не чаще, чем раз
+в AVATAR_RESCAN_SECONDS секунд, и при добавлении или удалении файлов список
+сканируется заново.
+"""
+
+import os
+import random
+import time
+from threading import Lock
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+AVATARS_DIR = "avatars"
+DEFAULT_AVATAR = f"{AVATARS_DIR}/default.png"
+
+
+class AvatarRegistry:
+    """
+    Кешированный список файлов аватарок
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._avatars: Tuple[str, ...] = ()
+        self._directory: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._checked_at: Optional[float] = None
+
+    @staticmethod
+    def directory() -> str:
+        return os.path.join(settings.MEDIA_ROOT, AVATARS_DIR)
+
+    def scan(self) -> Tuple[str, ...]:
+        """
+        Прочитать каталог аватарок заново
+
+        Returns:
+            Пути аватарок относительно MEDIA_ROOT
+        """
+        directory = self.directory()
+        try:
+            mtime = os.stat(directory).st_mtime
+            with os.scandir(directory) as entries:
+                # is_file() берет тип из записи каталога без отдельного stat
+                avatars = tuple(
+                    sorted(
+                        f"{AVATARS_DIR}/{entry.name}"
+                        for entry in entries
+                        if entry.is_file() and not entry.name.startswith(".")
+                    )
+                )
+        except FileNotFoundError:
+            mtime, avatars = None, ()
+
+        with self._lock:
+            self._avatars = avatars
+            self._directory = directory
+            self._mtime = mtime
+            self._checked_at = time.monotonic()
+        return avatars
+
+    def avatars(self) -> Tuple[str, ...]:
+        """
+        Список аватарок с проверкой изменения каталога не чаще,
+        чем раз в AVATAR_RESCAN_SECONDS секунд
+
+        Returns:
+            Пути аватарок относительно MEDIA_ROOT
+        """
+        directory = self.directory()
+        # MEDIA_ROOT мог измениться (например, в тестах)
+        if directory != self._directory:
+            return self.scan()
+
+        if time.monotonic() - self._checked_at < settings.AVATAR_RESCAN_SECONDS:
+            return self._avatars
+
+        try:
+            mtime = os.stat(directory).st_mtime
+        except FileNotFoundError:
+            mtime = None
+
+        if mtime != self._mtime:
+            return self.scan()
+
+        self._checked_at = time.monotonic()
+        return self._avatars
+
+    def random_avatar(self) -> str:
+        avatars = self.avatars()
+        if not avatars:
+            return DEFAULT_AVATAR
+        return random.choice(avatars)
+
+
+avatar_registry = AvatarRegistry()
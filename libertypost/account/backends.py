@@ -1,10 +1,55 @@
 # файл: accounts/backends.py
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Q
 
+from articles.cache import KEY_PREFIX
+
 UserModel = get_user_model()
 
+# Пользователь для request.user хранится в кеше, сбрасывается сигналами
+# (см. account/signals.py), а время жизни ограничивает изменения в обход save()
+USER_CACHE_TIMEOUT = 60 * 5
+
+
+def user_cache_key(user_id) -> str:
+    return f"{KEY_PREFIX}:user:{user_id}"
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    Стандартная аутентификация Django, но пользователь сессии загружается
+    из кеша, а не из базы данных на каждый запрос. Кеш сбрасывается при
+    сохранении и удалении пользователя, в том числе при смене пароля,
+    после чего хеш сессии перестает совпадать и сессия завершается.
+    Если кеш не общий для всех воркеров (CACHE_SHARED = False), пользователь
+    загружается из базы данных, как в ModelBackend.
+    """
+
+    def get_user(self, user_id):
+        if not settings.CACHE_SHARED:
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        if not settings.CACHE_SHARED:
+            return await super().aget_user(user_id)
+        key = user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await cache.aset(key, user, USER_CACHE_TIMEOUT)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
 
 class EmailOrUsernameBackend(ModelBackend):
     """
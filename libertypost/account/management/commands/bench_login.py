@@ -0,0 +1,81 @@
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from account.forms import CustomAuthenticationForm
+from account.models import User
+from core.benchmarks import benchmark_database, measure
+
+USERNAME = "bench-login"
+PASSWORD = "Bench-Login-Pass-123"
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк входа: проверка пароля дважды (форма и повторный authenticate,
+    как раньше в login_view), один раз (form.get_user()), вход через
+    представление целиком и отклонение попыток сверх лимита. Замеры идут
+    в одном потоке, поэтому входов в секунду - пропускная способность
+    одного воркера. Используется хешер паролей из настроек (PASSWORD_HASHERS).
+    """
+
+    help = "Замерить количество входов в секунду на один воркер"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        data = {"username": USERNAME, "password": PASSWORD}
+        request = RequestFactory().post(reverse("account:login"), data)
+
+        def form_user():
+            form = CustomAuthenticationForm(request, data=data)
+            assert form.is_valid()
+            return form
+
+        def double_check():
+            form = form_user()
+            authenticate(
+                username=form.cleaned_data["username"],
+                password=form.cleaned_data["password"],
+            )
+
+        def single_check():
+            form_user().get_user()
+
+        client = Client(HTTP_HOST="localhost")
+
+        def view_login():
+            response = client.post(reverse("account:login"), data)
+            assert response.status_code == 302, response.status_code
+
+        def throttled_login():
+            response = client.post(reverse("account:login"), data)
+            assert response.status_code == 429, response.status_code
+
+        with benchmark_database():
+            User.objects.create_user(USERNAME, "login@example.com", PASSWORD)
+            cache.clear()
+
+            with override_settings(LOGIN_ATTEMPTS_PER_IP=repeat * 10):
+                results = [
+                    ("две проверки пароля", measure(double_check, repeat=repeat)),
+                    ("одна проверка пароля", measure(single_check, repeat=repeat)),
+                    ("вход через представление", measure(view_login, repeat=repeat)),
+                ]
+            with override_settings(LOGIN_ATTEMPTS_PER_IP=0):
+                results.append(
+                    ("отклонение по лимиту", measure(throttled_login, repeat=repeat))
+                )
+            cache.clear()
+
+        self.stdout.write(f"{'Режим':<26} {'медиана, мс':>12} {'входов/с':>10}")
+        for name, result in results:
+            self.stdout.write(
+                f"{name:<26} {result['median_ms']:>12.2f} "
+                f"{1000 / max(result['median_ms'], 1e-6):>10.1f}"
+            )
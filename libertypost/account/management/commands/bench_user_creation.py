@@ -0,0 +1,119 @@
+import os
+import random
+from contextlib import contextmanager
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from account.avatars import AVATARS_DIR, DEFAULT_AVATAR, avatar_registry
+from account.models import User
+from core.benchmarks import benchmark_database, measure
+
+# Функции, через которые идут обращения к файловой системе при выборе аватарки
+# (os.path.exists и os.path.isfile вызывают os.stat)
+FS_CALLS = ("stat", "listdir", "scandir")
+
+
+def listing_avatar():
+    """
+    Прежний выбор аватарки: чтение каталога при каждом вызове
+    """
+    avatars_dir = os.path.join(settings.MEDIA_ROOT, AVATARS_DIR)
+
+    if not os.path.exists(avatars_dir):
+        return DEFAULT_AVATAR
+
+    avatars = [
+        f
+        for f in os.listdir(avatars_dir)
+        if os.path.isfile(os.path.join(avatars_dir, f))
+    ]
+
+    if not avatars:
+        return DEFAULT_AVATAR
+
+    return os.path.join(AVATARS_DIR, random.choice(avatars))
+
+
+@contextmanager
+def avatar_default(func):
+    field = User._meta.get_field("image")
+    original = field.default
+    field.default = func
+    # Field кеширует функцию значения по умолчанию
+    field.__dict__.pop("_get_default", None)
+    try:
+        yield
+    finally:
+        field.default = original
+        field.__dict__.pop("_get_default", None)
+
+
+@contextmanager
+def count_fs_calls(counter):
+    with mock.patch.multiple(
+        os,
+        **{name: mock.Mock(wraps=getattr(os, name)) for name in FS_CALLS},
+    ):
+        try:
+            yield
+        finally:
+            counter[0] = sum(getattr(os, name).call_count for name in FS_CALLS)
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк массового создания пользователей с выбором аватарки по умолчанию:
+    чтение каталога при каждом вызове и кешированный список (account/avatars.py).
+    """
+
+    help = "Замерить массовое создание пользователей и обращения к файловой системе"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        total = options["users"]
+        batch = [0]
+
+        def create_users():
+            batch[0] += 1
+            User.objects.bulk_create(
+                [
+                    User(username=f"bench-{batch[0]}-{i}", email=f"u{i}@example.com")
+                    for i in range(total)
+                ],
+                batch_size=500,
+            )
+
+        modes = [
+            ("чтение каталога", listing_avatar),
+            ("кешированный список", User._meta.get_field("image").default),
+        ]
+        avatar_registry.scan()
+        self.stdout.write(
+            f"Пользователей за повтор: {total}, "
+            f"аватарок в каталоге: {len(avatar_registry.avatars())}"
+        )
+
+        results = []
+        with benchmark_database():
+            for name, func in modes:
+                calls = [0]
+                with avatar_default(func):
+                    result = measure(create_users, repeat=options["repeat"])
+                    with count_fs_calls(calls):
+                        create_users()
+                results.append((name, result, calls[0]))
+
+        self.stdout.write(
+            f"{'Режим':<22} {'медиана, мс':>12} {'минимум, мс':>12} "
+            f"{'обращений к ФС':>15}"
+        )
+        for name, result, calls in results:
+            self.stdout.write(
+                f"{name:<22} {result['median_ms']:>12.2f} {result['min_ms']:>12.2f} "
+                f"{calls:>15}"
+            )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from account.avatars import DEFAULT_AVATAR, avatar_registry
+
+
+class Command(BaseCommand):
+    """
+    Команда для проверки списка аватарок по умолчанию после изменения
+    каталога MEDIA_ROOT/avatars. Работающие процессы подхватывают изменения
+    сами в течение AVATAR_RESCAN_SECONDS секунд.
+    """
+
+    help = "Просканировать каталог аватарок по умолчанию"
+
+    def handle(self, *args, **options):
+        avatars = avatar_registry.scan()
+        for avatar in avatars:
+            self.stdout.write(avatar)
+
+        if not avatars:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Каталог {avatar_registry.directory()} пуст или не найден, "
+                    f"будет использоваться {DEFAULT_AVATAR}"
+                )
+            )
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Аватарок: {len(avatars)}"))
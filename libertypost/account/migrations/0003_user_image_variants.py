@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0002_alter_user_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
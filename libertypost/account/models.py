@@ -1,32 +1,16 @@
-import os
-import random
-
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.urls import reverse
 
+from .avatars import avatar_registry
+
 
 def get_random_avatar():
     """
     Функция для получения случайной аватарки из папки avatars
+    (список файлов кешируется, см. account/avatars.py)
     """
-    avatars_dir = os.path.join("media", "avatars")
-
-    if not os.path.exists(avatars_dir):
-        return "avatars/default.png"
-
-    avatars = [
-        f
-        for f in os.listdir(avatars_dir)
-        if os.path.isfile(os.path.join(avatars_dir, f))
-    ]
-
-    if not avatars:
-        return "avatars/default.png"
-
-    random_avatar = random.choice(avatars)
-
-    return os.path.join("avatars", random_avatar)
+    return avatar_registry.random_avatar()
 
 
 class User(AbstractUser):
@@ -37,6 +21,8 @@ class User(AbstractUser):
     image = models.ImageField(
         upload_to="avatars/", default=get_random_avatar, verbose_name="Аватарка"
     )
+    # Уменьшенные копии аватарки (см. core/images.py)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     REQUIRED_FIELDS = ["email"]
 
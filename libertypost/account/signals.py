@@ -0,0 +1,28 @@
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.images import AVATAR_VARIANTS, schedule_variants
+
+from .backends import user_cache_key
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # После фиксации транзакции, иначе параллельный запрос успеет
+    # закешировать старую запись
+    transaction.on_commit(partial(cache.delete, user_cache_key(instance.pk)))
+
+
+@receiver(post_save, sender=User)
+def build_avatar_variants(sender, instance, raw=False, **kwargs):
+    """
+    Построить уменьшенные копии новой аватарки в фоне
+    """
+    if not raw:
+        schedule_variants(instance, "image", AVATAR_VARIANTS)
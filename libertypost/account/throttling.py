@@ -0,0 +1,93 @@
+"""
+Ограничение частоты попыток входа.
+
+Проверка пароля - самая дорогая операция входа (хеширование занимает
+десятки миллисекунд процессора), поэтому лимиты проверяются до нее:
+- все попытки с одного IP-адреса (защита от потока запросов);
+- неудачные попытки для одного логина (подбор пароля с разных адресов).
+
+Счетчики хранятся в кеше (CACHE_BACKEND) в окнах по LOGIN_THROTTLE_WINDOW
+секунд. С кешем в памяти процесса лимиты считаются отдельно в каждом воркере.
+"""
+
+import hashlib
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from articles.cache import KEY_PREFIX
+
+
+def client_ip(request) -> str:
+    """
+    IP-адрес клиента. За прокси (nginx) адрес берется из заголовка
+    LOGIN_THROTTLE_IP_HEADER, иначе все клиенты имели бы адрес прокси.
+    """
+    header = settings.LOGIN_THROTTLE_IP_HEADER
+    if header and request.META.get(header):
+        return request.META[header].split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+class LoginThrottle:
+    """
+    Счетчики попыток входа по IP-адресу и логину
+    """
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return f"{KEY_PREFIX}:login:ip:{ip}"
+
+    @staticmethod
+    def _username_key(username: str) -> str:
+        # Логин вводит пользователь, поэтому в ключ попадает его хеш
+        digest = hashlib.sha256(username.strip().lower().encode()).hexdigest()
+        return f"{KEY_PREFIX}:login:user:{digest}"
+
+    @staticmethod
+    def _increment(key: str) -> int:
+        # add не продлевает окно, если счетчик уже есть
+        cache.add(key, 0, settings.LOGIN_THROTTLE_WINDOW)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Окно истекло между add и incr
+            cache.set(key, 1, settings.LOGIN_THROTTLE_WINDOW)
+            return 1
+
+    @staticmethod
+    def register_attempt(ip: str, username: str) -> Optional[int]:
+        """
+        Учесть попытку входа и проверить лимиты
+
+        Args:
+            ip: IP-адрес клиента
+            username: Введенный логин
+
+        Returns:
+            None, если попытку можно проверять, иначе через сколько секунд
+            повторить попытку
+        """
+        attempts = LoginThrottle._increment(LoginThrottle._ip_key(ip))
+        failures = cache.get(LoginThrottle._username_key(username), 0)
+        if (
+            attempts > settings.LOGIN_ATTEMPTS_PER_IP
+            or failures >= settings.LOGIN_FAILURES_PER_USERNAME
+        ):
+            return settings.LOGIN_THROTTLE_WINDOW
+        return None
+
+    @staticmethod
+    def register_failure(username: str) -> None:
+        """
+        Учесть неверный пароль для логина
+        """
+        LoginThrottle._increment(LoginThrottle._username_key(username))
+
+    @staticmethod
+    def reset(username: str) -> None:
+        """
+        Сбросить неудачные попытки после успешного входа
+        """
+        cache.delete(LoginThrottle._username_key(username))
@@ -1,11 +1,14 @@
 from articles.dao import ArticleDAO, UserDAO
+from articles.decorators import query_budget
+from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 
 from .forms import CustomAuthenticationForm, CustomUserCreationForm
 from .models import User
+from .throttling import LoginThrottle, client_ip
 
 
 def register_view(request):
@@ -16,7 +19,8 @@ def register_view(request):
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
             user = form.save()
-            login(request, user)
+            # Бэкендов несколько, новый пользователь входит через основной
+            login(request, user, backend=settings.AUTHENTICATION_BACKENDS[0])
             messages.success(request, "Регистрация прошла успешно!")
             return redirect("home")
         else:
@@ -31,19 +35,28 @@ def login_view(request):
     Представление для входа пользователей
     """
     if request.method == "POST":
+        username = request.POST.get("username", "")
+        # Лимиты проверяются до проверки пароля
+        retry_after = LoginThrottle.register_attempt(client_ip(request), username)
+        if retry_after is not None:
+            messages.error(request, "Слишком много попыток входа, попробуйте позже")
+            form = CustomAuthenticationForm(request, initial={"username": username})
+            response = render(request, "account/login.html", {"form": form}, status=429)
+            response["Retry-After"] = str(retry_after)
+            return response
+
+        # Форма проверяет пароль (authenticate) при валидации,
+        # пользователь берется из нее без повторного хеширования
         form = CustomAuthenticationForm(request, data=request.POST)
         if form.is_valid():
-            username = form.cleaned_data.get("username")
-            password = form.cleaned_data.get("password")
-            user = authenticate(username=username, password=password)
-            if user is not None:
-                login(request, user)
-                messages.info(request, f"Вы вошли как {user.username}")
-                return redirect("home")
-            else:
-                messages.error(request, "Неверный логин или пароль")
-        else:
-            messages.error(request, "Неверный логин или пароль")
+            user = form.get_user()
+            LoginThrottle.reset(username)
+            login(request, user)
+            messages.info(request, f"Вы вошли как {user.username}")
+            return redirect("home")
+
+        LoginThrottle.register_failure(username)
+        messages.error(request, "Неверный логин или пароль")
     else:
         form = CustomAuthenticationForm()
     return render(request, "account/login.html", {"form": form})
@@ -59,6 +72,7 @@ def logout_view(request):
 
 
 @login_required
+@query_budget(12)
 def profile(request, status="published"):
     """
     Представление для отображения профиля текущего пользователя.
@@ -70,16 +84,19 @@ def profile(request, status="published"):
     user = request.user
     page = request.GET.get("page", 1)
 
+    # Количество статей берется из AuthorStats, а не подсчетом
+    user_stats = UserDAO.get_author_stats(user.id)
+
     result = ArticleDAO.get_articles_by_author(
         author_id=user.id,
         status=status,
         page=int(page),
         per_page=10,
-        order_by="-created_at",
+        order_by="newest",
+        count_strategy="cached",
+        count=user_stats.get(f"{status}_count"),
     )
 
-    user_stats = UserDAO.get_author_stats(user.id)
-
     context = {
         "user_profile": user,
         "articles": result["articles"],
@@ -94,6 +111,7 @@ def profile(request, status="published"):
     return render(request, "account/profile.html", context)
 
 
+@query_budget(8)
 def user_profile(request, user_id):
     """
     Представление для просмотра профиля другого пользователя.
@@ -103,27 +121,30 @@ def user_profile(request, user_id):
         user_id: ID пользователя, профиль которого нужно показать
     """
     user = get_object_or_404(User, id=user_id)
+    is_own_profile = request.user.is_authenticated and request.user.id == user.id
+
+    if is_own_profile:
+        return redirect("account:profile")
+
     page = request.GET.get("page", 1)
 
+    stats = UserDAO.get_author_stats(user.id)
     result = ArticleDAO.get_articles_by_author(
         author_id=user.id,
         status="published",
         page=int(page),
         per_page=10,
-        order_by="-created_at",
+        order_by="newest",
+        count_strategy="cached",
+        count=stats["published_count"],
     )
 
     user_stats = {
-        "published_count": result["total_articles"],
+        "published_count": stats["published_count"],
         "moderated_count": 0,
         "rejected_count": 0,
     }
 
-    is_own_profile = request.user.is_authenticated and request.user.id == user.id
-
-    if is_own_profile:
-        return redirect("account:profile")
-
     context = {
         "user_profile": user,
         "articles": result["articles"],
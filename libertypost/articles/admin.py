@@ -1,6 +1,10 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Count
 
+from .dao import ArticleDAO, UserDAO
 from .models import Article, Category, Comment
+from .rendering import render_article
 
 
 @admin.register(Article)
@@ -10,6 +14,7 @@ class ArticleAdmin(admin.ModelAdmin):
         "author_name",
         "status",
         "created_at",
+        "comment_count",
         "display_categories",
     )
     list_filter = ("status", "categories")
@@ -17,8 +22,12 @@ class ArticleAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
     date_hierarchy = "created_at"
     list_editable = ("status",)
+    list_select_related = ("author",)
     filter_horizontal = ("categories",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related("categories")
+
     def author_name(self, obj):
         return obj.author.username
 
@@ -29,6 +38,39 @@ class ArticleAdmin(admin.ModelAdmin):
 
     display_categories.short_description = "Категории"
 
+    def save_model(self, request, obj, form, change):
+        render_article(obj)
+
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+
+            if not change:
+                UserDAO.record_status_change(obj.author_id, None, obj.status)
+            elif {"status", "author"} & set(form.changed_data):
+                # В форме списка (list_editable) нет поля автора
+                UserDAO.record_status_change(
+                    form.initial.get("author", obj.author_id),
+                    form.initial["status"],
+                    None,
+                )
+                UserDAO.record_status_change(obj.author_id, None, obj.status)
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Article.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        # Вместе со статьями каскадно удаляются комментарии, поэтому статистика
+        # пересчитывается и для авторов статей, и для авторов комментариев
+        with transaction.atomic():
+            author_ids = set(queryset.values_list("author_id", flat=True))
+            author_ids.update(
+                Comment.objects.filter(article__in=queryset).values_list(
+                    "author_id", flat=True
+                )
+            )
+            super().delete_queryset(request, queryset)
+            UserDAO.rebuild_author_stats(list(author_ids))
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -56,3 +98,47 @@ class CommentAdmin(admin.ModelAdmin):
         return obj.author.username
 
     author_name.short_description = "Автор"
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            if not change:
+                ArticleDAO.adjust_comment_count(obj.article_id, 1)
+                UserDAO.adjust_author_stats(obj.author_id, comments_count=1)
+            else:
+                if "article" in form.changed_data:
+                    ArticleDAO.adjust_comment_count(form.initial["article"], -1)
+                    ArticleDAO.adjust_comment_count(obj.article_id, 1)
+                if "author" in form.changed_data:
+                    UserDAO.adjust_author_stats(
+                        form.initial["author"], comments_count=-1
+                    )
+                    UserDAO.adjust_author_stats(obj.author_id, comments_count=1)
+
+            super().save_model(request, obj, form, change)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            ArticleDAO.adjust_comment_count(obj.article_id, -1)
+            UserDAO.adjust_author_stats(obj.author_id, comments_count=-1)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            deleted = list(
+                queryset.order_by()
+                .values("article_id")
+                .annotate(count=Count("id"))
+                .values_list("article_id", "count")
+            )
+            authors = list(
+                queryset.order_by()
+                .values("author_id")
+                .annotate(count=Count("id"))
+                .values_list("author_id", "count")
+            )
+            super().delete_queryset(request, queryset)
+
+            for article_id, count in deleted:
+                ArticleDAO.adjust_comment_count(article_id, -count)
+            for author_id, count in authors:
+                UserDAO.adjust_author_stats(author_id, comments_count=-count)
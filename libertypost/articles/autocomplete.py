@@ -0,0 +1,231 @@
+"""
+Подсказки для строки поиска по префиксу заголовков статей и названий категорий.
+
+Индекс хранится в памяти процесса и не обращается к базе данных на каждый запрос.
+Сигналы увеличивают версии пространств имен кеша, и при следующем запросе индекс
+обновляется: измененные статьи догружаются по updated_at (с запасом на поздно
+зафиксированные транзакции), категории (их немного) перечитываются целиком,
+а после удаления статей индекс строится заново.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Max
+
+from .cache import get_versions
+from .models import Article, Category
+
+# Пространства имен версий кеша: изменения статей, удаление статей, категории
+AUTOCOMPLETE_NAMESPACE = "autocomplete"
+AUTOCOMPLETE_RESET_NAMESPACE = "autocomplete:reset"
+CATEGORIES_NAMESPACE = "categories"
+
+# Полная перестройка индекса на случай пропущенных инкрементальных обновлений
+AUTOCOMPLETE_REBUILD_INTERVAL = 60 * 60
+# Запас при догрузке измененных статей: updated_at задают часы воркера до фиксации
+# транзакции, поэтому статья, зафиксированная после синхронизации, может иметь
+# updated_at раньше отметки. Повторная загрузка статьи индекс не портит.
+AUTOCOMPLETE_SYNC_OVERLAP = timedelta(minutes=5)
+AUTOCOMPLETE_MIN_PREFIX = 2
+AUTOCOMPLETE_LIMIT = 8
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_term(text: str) -> str:
+    """
+    Привести текст к виду для сравнения префиксов: нижний регистр, ё -> е,
+    слова через один пробел
+
+    Args:
+        text: Исходный текст
+
+    Returns:
+        Нормализованная строка
+    """
+    return " ".join(_WORD_RE.findall(text.casefold().replace("ё", "е")))
+
+
+class PrefixIndex:
+    """
+    Отсортированный список ключей для поиска по префиксу через bisect.
+    Для каждой записи индексируются все "хвосты" текста, начиная с каждого слова,
+    поэтому подсказка находится и по началу любого слова заголовка.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, Tuple[str, int]]] = []
+        self._entries: Dict[Tuple[str, int], Dict[str, str]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _suffixes(text: str) -> List[str]:
+        words = normalize_term(text).split()
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def add(self, kind: str, pk: int, text: str, url: str) -> None:
+        self.remove(kind, pk)
+        entry_id = (kind, pk)
+        self._entries[entry_id] = {"text": text, "kind": kind, "url": url}
+        for suffix in self._suffixes(text):
+            position = bisect_left(self._keys, (suffix, entry_id))
+            self._keys.insert(position, (suffix, entry_id))
+
+    def extend(self, entries: List[Tuple[str, int, str, str]]) -> None:
+        """
+        Добавить новые записи (kind, pk, text, url) с одной сортировкой
+        вместо вставки каждого ключа, для первоначального построения
+        """
+        for kind, pk, text, url in entries:
+            self._entries[(kind, pk)] = {"text": text, "kind": kind, "url": url}
+            self._keys.extend((suffix, (kind, pk)) for suffix in self._suffixes(text))
+        self._keys.sort()
+
+    def remove(self, kind: str, pk: int) -> None:
+        entry = self._entries.pop((kind, pk), None)
+        if entry is None:
+            return
+        for suffix in self._suffixes(entry["text"]):
+            position = bisect_left(self._keys, (suffix, (kind, pk)))
+            if position < len(self._keys) and self._keys[position] == (
+                suffix,
+                (kind, pk),
+            ):
+                del self._keys[position]
+
+    def remove_kind(self, kind: str) -> None:
+        for entry_kind, pk in list(self._entries):
+            if entry_kind == kind:
+                self.remove(entry_kind, pk)
+
+    def search(self, prefix: str, limit: int) -> List[Dict[str, str]]:
+        prefix = normalize_term(prefix)
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and len(results) < limit:
+            key, entry_id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            if entry_id not in seen:
+                seen.add(entry_id)
+                results.append(self._entries[entry_id])
+            position += 1
+
+        return results
+
+
+class Autocomplete:
+    """
+    Индекс подсказок процесса с ленивой синхронизацией по версиям кеша
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index: Optional[PrefixIndex] = None
+        self._versions: Dict[str, int] = {}
+        self._built_at = 0.0
+        self._synced_until = None
+
+    @staticmethod
+    def _build() -> PrefixIndex:
+        index = PrefixIndex()
+        articles = Article.objects.filter(status="published").only("id", "title")
+        index.extend(
+            ("article", article.pk, article.title, article.get_absolute_url())
+            for article in articles.iterator()
+        )
+        Autocomplete._load_categories(index)
+        return index
+
+    @staticmethod
+    def _load_articles(index: PrefixIndex, since) -> None:
+        articles = Article.objects.filter(updated_at__gte=since).only(
+            "id", "title", "status"
+        )
+        for article in articles.iterator():
+            if article.status == "published":
+                index.add(
+                    "article", article.pk, article.title, article.get_absolute_url()
+                )
+            else:
+                index.remove("article", article.pk)
+
+    @staticmethod
+    def _load_categories(index: PrefixIndex) -> None:
+        index.remove_kind("category")
+        for category in Category.objects.only("id", "name", "slug"):
+            index.add(
+                "category", category.pk, category.name, category.get_absolute_url()
+            )
+
+    def _sync(self) -> PrefixIndex:
+        versions = get_versions(
+            AUTOCOMPLETE_NAMESPACE, AUTOCOMPLETE_RESET_NAMESPACE, CATEGORIES_NAMESPACE
+        )
+        expired = time.monotonic() - self._built_at > AUTOCOMPLETE_REBUILD_INTERVAL
+        if versions == self._versions and self._index is not None and not expired:
+            return self._index
+
+        # Отметку берем до чтения, чтобы не пропустить статьи, измененные во время него
+        synced_until = Article.objects.aggregate(last=Max("updated_at"))["last"]
+
+        if (
+            self._index is None
+            or expired
+            or self._synced_until is None
+            or versions[AUTOCOMPLETE_RESET_NAMESPACE]
+            != self._versions.get(AUTOCOMPLETE_RESET_NAMESPACE)
+        ):
+            index = self._build()
+            self._built_at = time.monotonic()
+        else:
+            index = self._index
+            if versions[AUTOCOMPLETE_NAMESPACE] != self._versions.get(
+                AUTOCOMPLETE_NAMESPACE
+            ):
+                self._load_articles(
+                    index, since=self._synced_until - AUTOCOMPLETE_SYNC_OVERLAP
+                )
+            if versions[CATEGORIES_NAMESPACE] != self._versions.get(
+                CATEGORIES_NAMESPACE
+            ):
+                self._load_categories(index)
+
+        self._index = index
+        self._versions = versions
+        self._synced_until = synced_until or self._synced_until
+        return index
+
+    def suggest(
+        self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT
+    ) -> List[Dict[str, str]]:
+        """
+        Получить подсказки по префиксу
+
+        Args:
+            prefix: Введенный пользователем текст
+            limit: Максимальное количество подсказок
+
+        Returns:
+            Список подсказок {"text", "kind", "url"}
+        """
+        if len(normalize_term(prefix)) < AUTOCOMPLETE_MIN_PREFIX:
+            return []
+
+        with self._lock:
+            index = self._sync()
+            return index.search(prefix, limit)
+
+
+autocomplete = Autocomplete()
@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = "libertypost"
+
+# Кеш в памяти процесса: {(пространство имен, ключ): (версия, значение)}
+_local_cache: Dict[tuple, tuple] = {}
+
+
+def _version_key(namespace: str) -> str:
+    return f"{KEY_PREFIX}:version:{namespace}"
+
+
+def _initial_version() -> int:
+    # Начальная версия зависит от времени, чтобы после вытеснения ключа из кеша
+    # версия не совпала с одной из уже использованных
+    return time.time_ns() // 1000
+
+
+def get_versions(*namespaces: str) -> Dict[str, int]:
+    """
+    Получить текущие версии нескольких пространств имен кеша одним запросом
+
+    Args:
+        namespaces: Названия пространств имен
+
+    Returns:
+        Словарь {пространство имен: версия}
+    """
+    keys = {_version_key(namespace): namespace for namespace in namespaces}
+    stored = cache.get_many(keys.keys())
+    versions = {}
+
+    for key, namespace in keys.items():
+        version = stored.get(key)
+        if version is None:
+            cache.add(key, _initial_version(), None)
+            version = cache.get(key)
+        versions[namespace] = version
+
+    return versions
+
+
+def get_version(namespace: str) -> int:
+    """
+    Получить текущую версию пространства имен кеша
+
+    Args:
+        namespace: Название пространства имен
+
+    Returns:
+        Номер версии
+    """
+    return get_versions(namespace)[namespace]
+
+
+class _ReplicaBumps:
+    """
+    Повторное увеличение версий после окна репликации. Пока реплика отстает,
+    анонимный запрос может прочитать с нее старые данные и закешировать их
+    под уже новой версией; повторное увеличение сбрасывает такие записи.
+    Увеличения, запланированные в одном окне, выполняются одним таймером.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, float] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def schedule(self, namespaces, delay: float) -> None:
+        deadline = time.monotonic() + delay
+        with self._lock:
+            for namespace in namespaces:
+                self._pending[namespace] = deadline
+            if self._timer is None:
+                self._start(delay)
+
+    def _start(self, delay: float) -> None:
+        # Не фоновый поток: команда manage.py дождется повторного сброса
+        self._timer = threading.Timer(delay, self._flush)
+        self._timer.start()
+
+    def _flush(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            due = [ns for ns, deadline in self._pending.items() if deadline <= now]
+            for namespace in due:
+                del self._pending[namespace]
+            self._timer = None
+            if self._pending:
+                self._start(max(min(self._pending.values()) - now, 0))
+        bump_version(*due)
+
+
+_replica_bumps = _ReplicaBumps()
+
+
+def bump_version(*namespaces: str, replicated: bool = False) -> None:
+    """
+    Инвалидировать все ключи пространств имен, увеличив их версии
+
+    Args:
+        namespaces: Названия пространств имен
+        replicated: Данные записаны в основную базу: при настроенных репликах
+            версии увеличиваются еще раз через DB_REPLICA_PIN_SECONDS секунд
+    """
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), None)
+
+    if replicated and namespaces and settings.DATABASE_REPLICAS:
+        _replica_bumps.schedule(namespaces, settings.DB_REPLICA_PIN_SECONDS)
+
+
+def make_key(namespace: str, *parts) -> str:
+    """
+    Построить ключ кеша, привязанный к текущей версии пространства имен
+
+    Args:
+        namespace: Название пространства имен
+        parts: Части ключа
+
+    Returns:
+        Строка ключа
+    """
+    version = get_version(namespace)
+    suffix = ":".join(str(part) for part in parts)
+    return f"{KEY_PREFIX}:{namespace}:{version}:{suffix}"
+
+
+def get_or_set(
+    namespace: str,
+    key: str,
+    producer: Callable[[], Any],
+    timeout: Optional[int] = None,
+) -> Any:
+    """
+    Получить значение из двухуровневого кеша: сначала из памяти процесса,
+    затем из общего бэкенда, и только потом вычислить его.
+    Оба уровня привязаны к версии пространства имен, поэтому bump_version
+    сбрасывает значение во всех процессах.
+
+    Args:
+        namespace: Название пространства имен
+        key: Ключ внутри пространства имен
+        producer: Функция, вычисляющая значение при промахе
+        timeout: Время жизни значения в общем кеше (None - без ограничения)
+
+    Returns:
+        Закешированное или вычисленное значение
+    """
+    version = get_version(namespace)
+    local = _local_cache.get((namespace, key))
+    if local is not None and local[0] == version:
+        return local[1]
+
+    shared_key = f"{KEY_PREFIX}:{namespace}:{version}:{key}"
+    value = cache.get(shared_key)
+    if value is None:
+        value = producer()
+        cache.set(shared_key, value, timeout)
+
+    _local_cache[(namespace, key)] = (version, value)
+    return value
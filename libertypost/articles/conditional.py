@@ -0,0 +1,111 @@
+"""
+Валидаторы для условных GET-запросов (ETag / Last-Modified).
+
+Валидатор вычисляется до отрисовки страницы одним индексированным запросом
+и версиями тегов кеша страниц (см. articles.page_cache), поэтому повторный
+визит с If-None-Match / If-Modified-Since получает 304 без загрузки данных.
+ETag включает ID пользователя, так как вошедшие пользователи видят другую
+страницу; Last-Modified отдается только анонимным читателям и только для
+страницы статьи: на страницах списков меняются не только статьи (счетчики
+комментариев, порядок), поэтому там используется только ETag.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from django.http import HttpRequest
+
+from .dao import ArticleDAO
+from .page_cache import LAYOUT_TAG, MESSAGES_COOKIE_NAME, get_tag_versions
+from .pagination import listing_page_params
+
+_STATE_ATTRIBUTE = "_conditional_state"
+
+
+def _make_etag(request: HttpRequest, state: Dict[str, Any], tags) -> str:
+    user_id = request.user.id if request.user.is_authenticated else None
+    versions = get_tag_versions([LAYOUT_TAG, *tags])
+    raw = json.dumps([user_id, versions, state], default=str, sort_keys=True)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _get_state(request: HttpRequest, loader) -> Optional[Dict[str, Any]]:
+    # etag_func и last_modified_func вызываются по очереди, запрос выполняется один раз
+    if not hasattr(request, _STATE_ATTRIBUTE):
+        state = None
+        # Непоказанные сообщения должны попасть на страницу, а не потеряться в 304
+        if request.method in ("GET", "HEAD") and (
+            MESSAGES_COOKIE_NAME not in request.COOKIES
+        ):
+            state = loader()
+        setattr(request, _STATE_ATTRIBUTE, state)
+    return getattr(request, _STATE_ATTRIBUTE)
+
+
+def _anonymous_last_modified(request: HttpRequest, value):
+    if request.user.is_authenticated:
+        return None
+    return value
+
+
+def _article_state(request: HttpRequest, article_id: int):
+    return _get_state(request, lambda: ArticleDAO.get_article_state(article_id))
+
+
+def article_etag(request: HttpRequest, article_id: int) -> Optional[str]:
+    state = _article_state(request, article_id)
+    if state is None:
+        return None
+    author_id = state["author_id"]
+    return _make_etag(
+        request,
+        {**state, "page": request.GET.get("page")},
+        [f"author:{author_id}", f"author-stats:{author_id}"],
+    )
+
+
+def article_last_modified(request: HttpRequest, article_id: int):
+    state = _article_state(request, article_id)
+    if state is None:
+        return None
+    # Удаление комментария обновляет updated_at статьи (см. signals),
+    # поэтому значение не уменьшается
+    last_modified = max(filter(None, (state["updated_at"], state["last_comment_at"])))
+    return _anonymous_last_modified(request, last_modified)
+
+
+def _feed_state(request: HttpRequest):
+    return _get_state(
+        request,
+        lambda: ArticleDAO.get_listing_state(**listing_page_params(request.GET)),
+    )
+
+
+def _category_state(request: HttpRequest, category_slug: str):
+    def load():
+        try:
+            page = int(request.GET.get("page", 1))
+        except ValueError:
+            page = 1
+        return ArticleDAO.get_listing_state(
+            category_slug=category_slug, page=page, count_strategy="estimated"
+        )
+
+    return _get_state(request, load)
+
+
+def _listing_etag(request: HttpRequest, state) -> Optional[str]:
+    # Пустая страница (несуществующая категория, неверный курсор) не кешируется
+    if not state or not state["articles"]:
+        return None
+    authors = {f"author:{row[1]}" for row in state["articles"]}
+    return _make_etag(request, state, sorted(authors))
+
+
+def feed_etag(request: HttpRequest) -> Optional[str]:
+    return _listing_etag(request, _feed_state(request))
+
+
+def category_etag(request: HttpRequest, category_slug: str) -> Optional[str]:
+    return _listing_etag(request, _category_state(request, category_slug))
@@ -1,25 +1,50 @@
 from django.db.models import Count
+from django.utils.functional import SimpleLazyObject
 
+from .cache import get_or_set
 from .models import Category
 
+# Категории меняются редко, кеш сбрасывается сигналами (см. signals.py)
+CATEGORIES_CACHE_TIMEOUT = 60 * 60
+
+
+def _get_categories():
+    return get_or_set(
+        "categories",
+        "all",
+        lambda: list(Category.objects.all()),
+        CATEGORIES_CACHE_TIMEOUT,
+    )
+
+
+def _get_top_categories():
+    return get_or_set(
+        "categories",
+        "top",
+        lambda: list(
+            Category.objects.annotate(articles_count=Count("articles")).order_by(
+                "-articles_count"
+            )[:7]
+        ),
+        CATEGORIES_CACHE_TIMEOUT,
+    )
+
 
 def categories(request):
     """
-    Контекстный процессор, который добавляет все категории в контекст шаблона
+    Контекстный процессор, который добавляет все категории в контекст шаблона.
+    Категории загружаются из кеша только при обращении к ним в шаблоне.
     """
     return {
-        "categories": Category.objects.all(),
+        "categories": SimpleLazyObject(_get_categories),
     }
 
 
 def top_categories(request):
     """
-    Контекстный процессор, который добавляет топ-5 категорий с наибольшим количеством статей в контекст шаблона
+    Контекстный процессор, который добавляет топ-5 категорий с наибольшим количеством статей в контекст шаблона.
+    Категории загружаются из кеша только при обращении к ним в шаблоне.
     """
-    categories = Category.objects.annotate(articles_count=Count("articles")).order_by(
-        "-articles_count"
-    )[:7]
-
     return {
-        "top_categories": categories,
+        "top_categories": SimpleLazyObject(_get_top_categories),
     }
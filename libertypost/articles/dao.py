@@ -1,11 +1,56 @@
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from django.core.paginator import Paginator
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 
-from .models import Article, Category, Comment, User
+from .models import Article, AuthorStats, Category, Comment, User
+from .pagination import paginate_queryset
+from .rendering import render_article
+from .search import get_cached_ids, get_search_backend
+from .sorting import (
+    DEFAULT_SORT,
+    SEARCH_SORT_MODES,
+    SORT_MODES,
+    get_ordering,
+    resolve_sort,
+)
+
+# Поля с полным текстом статьи, которые не нужны в списках (карточки используют превью)
+LIST_DEFERRED_FIELDS = ("content", "content_html")
+
+# Статусы статей, для каждого из которых в AuthorStats есть поле "<статус>_count"
+ARTICLE_STATUSES = ("published", "moderated", "rejected", "archived")
+
+
+def _card_categories_prefetch() -> Prefetch:
+    """
+    Предзагрузка категорий для карточек статей одним запросом на страницу
+    """
+    return Prefetch("categories", queryset=Category.objects.only("id", "name", "slug"))
+
+
+def _load_page(method: Callable, items_key: str, **kwargs) -> Dict[str, Any]:
+    """
+    Вызвать метод чтения со страницей объектов и сразу загрузить страницу,
+    чтобы шаблон не обращался к базе данных из асинхронного контекста
+
+    Args:
+        method: Синхронный метод DAO, возвращающий словарь с "page_obj"
+        items_key: Ключ словаря со списком объектов страницы
+        kwargs: Аргументы метода
+
+    Returns:
+        Результат метода с загруженным списком объектов
+    """
+    result = method(**kwargs)
+    page_obj = result["page_obj"]
+    page_obj.object_list = list(page_obj.object_list)
+    result[items_key] = page_obj.object_list
+    return result
 
 
 class ArticleDAO:
@@ -19,7 +64,11 @@ class ArticleDAO:
         page: int = 1,
         per_page: int = 10,
         status: str = "published",
-        order_by: str = "-created_at",
+        order_by: str = DEFAULT_SORT,
+        cursor: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_strategy: str = "exact",
     ) -> Dict[str, Any]:
         """
         Получить список статей с подсчетом количества комментариев
@@ -28,26 +77,39 @@ class ArticleDAO:
             page: Номер страницы
             per_page: Количество статей на страницу
             status: Статус статей для фильтрации
-            order_by: Поле для сортировки, по умолчанию сначала новые ("-created_at")
+            order_by: Режим сортировки (см. SORT_MODES), по умолчанию сначала новые
+            cursor: Использовать курсорную пагинацию вместо номеров страниц
+            after: Токен курсора, после которого начинается страница
+            before: Токен курсора, перед которым заканчивается страница
+            count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
 
         Returns:
             Словарь со статьями, их количеством комментариев и информацией о пагинации
         """
         queryset = (
             Article.objects.select_related("author")
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
             .filter(status=status)
-            .annotate(comment_count=Count("comments"))
-            .order_by(order_by)
+            .order_by(*get_ordering(order_by))
         )
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        page_obj, total = paginate_queryset(
+            queryset,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            after=after,
+            before=before,
+            order_by=get_ordering(order_by)[0],
+            count_strategy=count_strategy,
+        )
 
         return {
             "articles": page_obj.object_list,
             "page_obj": page_obj,
             "is_paginated": page_obj.has_other_pages(),
-            "total_articles": paginator.count,
+            "total_articles": total,
         }
 
     @staticmethod
@@ -56,7 +118,12 @@ class ArticleDAO:
         status: Optional[str] = None,
         page: int = 1,
         per_page: int = 10,
-        order_by: str = "-created_at",
+        order_by: str = DEFAULT_SORT,
+        cursor: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_strategy: str = "exact",
+        count: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Получить статьи конкретного автора с фильтрацией по статусу и пагинацией
@@ -66,32 +133,54 @@ class ArticleDAO:
             status: Статус статей для фильтрации (если None - все статьи)
             page: Номер страницы для пагинации
             per_page: Количество статей на страницу
-            order_by: Поле для сортировки, по умолчанию сначала новые ("-created_at")
+            order_by: Режим сортировки (см. SORT_MODES), по умолчанию сначала новые
+            cursor: Использовать курсорную пагинацию вместо номеров страниц
+            after: Токен курсора, после которого начинается страница
+            before: Токен курсора, перед которым заканчивается страница
+            count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
+            count: Заранее известное количество статей (например, из AuthorStats)
 
         Returns:
             Словарь с объектами статей и информацией о пагинации
         """
-        queryset = Article.objects.select_related("author").filter(author_id=author_id)
+        queryset = (
+            Article.objects.select_related("author")
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
+            .filter(author_id=author_id)
+        )
 
         if status:
             queryset = queryset.filter(status=status)
 
-        # Добавляем подсчет комментариев и сортировку
-        queryset = queryset.annotate(comment_count=Count("comments")).order_by(order_by)
-
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        queryset = queryset.order_by(*get_ordering(order_by))
+
+        page_obj, total = paginate_queryset(
+            queryset,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            after=after,
+            before=before,
+            order_by=get_ordering(order_by)[0],
+            count_strategy=count_strategy,
+            count=count,
+        )
 
         return {
             "articles": page_obj.object_list,
             "page_obj": page_obj,
             "is_paginated": page_obj.has_other_pages(),
-            "total_articles": paginator.count,
+            "total_articles": total,
         }
 
     @staticmethod
     def get_articles_by_status(
-        status: str, page: int = 1, per_page: int = 10, order_by: str = "-created_at"
+        status: str,
+        page: int = 1,
+        per_page: int = 10,
+        order_by: str = DEFAULT_SORT,
+        count_strategy: str = "exact",
     ) -> Dict[str, Any]:
         """
         Получить все статьи с определенным статусом
@@ -100,26 +189,29 @@ class ArticleDAO:
             status: Статус статей ("moderated", "published", "rejected")
             page: Номер страницы
             per_page: Количество статей на страницу
-            order_by: Поле для сортировки, по умолчанию сначала новые ("-created_at")
+            order_by: Режим сортировки (см. SORT_MODES), по умолчанию сначала новые
+            count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
 
         Returns:
             Словарь с объектами статей и информацией о пагинации
         """
         queryset = (
             Article.objects.select_related("author")
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
             .filter(status=status)
-            .annotate(comment_count=Count("comments"))
-            .order_by(order_by)
+            .order_by(*get_ordering(order_by))
         )
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        page_obj, total = paginate_queryset(
+            queryset, page=page, per_page=per_page, count_strategy=count_strategy
+        )
 
         return {
             "articles": page_obj.object_list,
             "page_obj": page_obj,
             "is_paginated": page_obj.has_other_pages(),
-            "total_articles": paginator.count,
+            "total_articles": total,
         }
 
     @staticmethod
@@ -127,7 +219,11 @@ class ArticleDAO:
         category_slug: str,
         page: int = 1,
         per_page: int = 10,
-        order_by: str = "-created_at",
+        order_by: str = DEFAULT_SORT,
+        cursor: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_strategy: str = "exact",
     ) -> Dict[str, Any]:
         """
         Получить опубликованные статьи по категории
@@ -136,7 +232,11 @@ class ArticleDAO:
             category_slug: Slug категории
             page: Номер страницы
             per_page: Количество статей на страницу
-            order_by: Поле для сортировки, по умолчанию сначала новые ("-created_at")
+            order_by: Режим сортировки (см. SORT_MODES), по умолчанию сначала новые
+            cursor: Использовать курсорную пагинацию вместо номеров страниц
+            after: Токен курсора, после которого начинается страница
+            before: Токен курсора, перед которым заканчивается страница
+            count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
 
         Returns:
             Словарь с объектами статей, категорией и информацией о пагинации
@@ -144,20 +244,29 @@ class ArticleDAO:
         category = get_object_or_404(Category, slug=category_slug)
         queryset = (
             Article.objects.select_related("author")
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
             .filter(categories=category, status="published")
-            .annotate(comment_count=Count("comments"))
-            .order_by(order_by)
+            .order_by(*get_ordering(order_by))
         )
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        page_obj, total = paginate_queryset(
+            queryset,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            after=after,
+            before=before,
+            order_by=get_ordering(order_by)[0],
+            count_strategy=count_strategy,
+        )
 
         return {
             "articles": page_obj.object_list,
             "category": category,
             "page_obj": page_obj,
             "is_paginated": page_obj.has_other_pages(),
-            "total_articles": paginator.count,
+            "total_articles": total,
         }
 
     @staticmethod
@@ -165,43 +274,69 @@ class ArticleDAO:
         query: str,
         page: int = 1,
         per_page: int = 10,
-        order_by: str = "-created_at",
+        order_by: str = DEFAULT_SORT,
         category_slug: Optional[str] = None,  # Новый необязательный параметр
+        count_strategy: str = "exact",
     ) -> Dict[str, Any]:
         """
-        Поиск статей по заголовку, содержимому и категории
+        Полнотекстовый поиск статей по заголовку и содержимому с фильтром по категории
 
         Args:
             query: Поисковый запрос
             page: Номер страницы
             per_page: Количество статей на страницу
-            order_by: Поле для сортировки, по умолчанию сначала новые ("-created_at")
+            order_by: Режим сортировки (см. SORT_MODES), по умолчанию сначала новые,
+                "relevance" - по релевантности запросу
             category_slug: Slug категории (необязательный)
+            count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
 
         Returns:
             Словарь с результатами поиска и информацией о пагинации
         """
-        queryset = Article.objects.select_related("author").filter(
-            Q(title__icontains=query) | Q(content__icontains=query),
-            status="published",
+        cards = (
+            Article.objects.select_related("author")
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
+            .filter(status="published")
         )
+        queryset = cards
+
+        backend = get_search_backend(queryset.db)
+        query = query.strip()
+        if query:
+            queryset = backend.filter(queryset, query)
 
         # Если указан category_slug, добавляем фильтрацию по категории
         if category_slug:
             queryset = queryset.filter(categories__slug=category_slug)
 
-        queryset = queryset.annotate(comment_count=Count("comments")).order_by(order_by)
+        sort = resolve_sort(order_by, SEARCH_SORT_MODES)
+        if sort == "relevance":
+            queryset = queryset.annotate(search_rank=backend.rank(query))
+        queryset = queryset.order_by(*SORT_MODES[sort])
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if not query:
+            page_obj, total = paginate_queryset(
+                queryset, page=page, per_page=per_page, count_strategy=count_strategy
+            )
+        else:
+            # Список ID результатов кешируется, на каждую страницу
+            # загружаются только ее статьи
+            ids = get_cached_ids(backend, query, queryset, category_slug or "", sort)
+            page_obj, total = paginate_queryset(ids, page=page, per_page=per_page)
+            articles = cards.in_bulk(page_obj.object_list)
+            page_obj.object_list = [
+                articles[pk] for pk in page_obj.object_list if pk in articles
+            ]
 
         return {
             "articles": page_obj.object_list,
             "query": query,
             "category_slug": category_slug,
+            "sort": sort,
             "page_obj": page_obj,
             "is_paginated": page_obj.has_other_pages(),
-            "total_articles": paginator.count,
+            "total_articles": total,
         }
 
     @staticmethod
@@ -238,14 +373,197 @@ class ArticleDAO:
         if prefetch_categories:
             queryset = queryset.prefetch_related("categories")
 
-        # Добавляем подсчет комментариев
-        queryset = queryset.annotate(comment_count=Count("comments"))
-
         return get_object_or_404(queryset, id=article_id)
 
+    @staticmethod
+    def get_article_detail(
+        article_id: int,
+        comments_page: int = 1,
+        comments_per_page: int = 20,
+        comments_order_by: str = "-created_at",
+    ) -> Dict[str, Any]:
+        """
+        Загрузить все данные страницы статьи за минимальное число запросов:
+        статью с автором и его статистикой, категории и одну страницу комментариев.
+        Общее количество комментариев берется из счетчика статьи без COUNT-запроса.
+
+        Args:
+            article_id: ID статьи
+            comments_page: Номер страницы комментариев
+            comments_per_page: Количество комментариев на страницу
+            comments_order_by: Порядок сортировки комментариев
+
+        Returns:
+            Словарь со статьей, комментариями и информацией о пагинации комментариев
+        """
+        queryset = Article.objects.select_related(
+            "author", "author__stats"
+        ).prefetch_related(_card_categories_prefetch())
+        article = get_object_or_404(queryset, id=article_id)
+
+        comments = CommentDAO.get_comments_for_article(
+            article_id=article.id,
+            page=comments_page,
+            per_page=comments_per_page,
+            order_by=comments_order_by,
+            count=article.comment_count,
+        )
+
+        try:
+            author_total_articles = article.author.stats.total_articles
+        except AuthorStats.DoesNotExist:
+            author_total_articles = UserDAO.get_author_stats(article.author_id)[
+                "total_articles"
+            ]
+
+        return {
+            "article": article,
+            "author_total_articles": author_total_articles,
+            **comments,
+        }
+
+    @staticmethod
+    async def aget_articles_with_comment_count(
+        page: int = 1,
+        per_page: int = 10,
+        status: str = "published",
+        order_by: str = DEFAULT_SORT,
+        cursor: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_strategy: str = "exact",
+    ) -> Dict[str, Any]:
+        """
+        Асинхронный вариант get_articles_with_comment_count (аргументы те же).
+        Подсчет и загрузка страницы выполняются за один переход в поток ORM.
+
+        Returns:
+            Словарь со статьями (уже загруженными) и информацией о пагинации
+        """
+        return await sync_to_async(_load_page)(
+            ArticleDAO.get_articles_with_comment_count,
+            "articles",
+            page=page,
+            per_page=per_page,
+            status=status,
+            order_by=order_by,
+            cursor=cursor,
+            after=after,
+            before=before,
+            count_strategy=count_strategy,
+        )
+
+    @staticmethod
+    async def aget_articles_by_category(
+        category_slug: str,
+        page: int = 1,
+        per_page: int = 10,
+        order_by: str = DEFAULT_SORT,
+        cursor: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_strategy: str = "exact",
+    ) -> Dict[str, Any]:
+        """
+        Асинхронный вариант get_articles_by_category (аргументы те же)
+
+        Returns:
+            Словарь со статьями (уже загруженными), категорией и пагинацией
+        """
+        return await sync_to_async(_load_page)(
+            ArticleDAO.get_articles_by_category,
+            "articles",
+            category_slug=category_slug,
+            page=page,
+            per_page=per_page,
+            order_by=order_by,
+            cursor=cursor,
+            after=after,
+            before=before,
+            count_strategy=count_strategy,
+        )
+
+    @staticmethod
+    async def asearch_articles(
+        query: str,
+        page: int = 1,
+        per_page: int = 10,
+        order_by: str = DEFAULT_SORT,
+        category_slug: Optional[str] = None,
+        count_strategy: str = "exact",
+    ) -> Dict[str, Any]:
+        """
+        Асинхронный вариант search_articles (аргументы те же)
+
+        Returns:
+            Словарь с результатами поиска (уже загруженными) и пагинацией
+        """
+        return await sync_to_async(_load_page)(
+            ArticleDAO.search_articles,
+            "articles",
+            query=query,
+            page=page,
+            per_page=per_page,
+            order_by=order_by,
+            category_slug=category_slug,
+            count_strategy=count_strategy,
+        )
+
+    @staticmethod
+    async def aget_article_detail(
+        article_id: int,
+        comments_page: int = 1,
+        comments_per_page: int = 20,
+        comments_order_by: str = "-created_at",
+    ) -> Dict[str, Any]:
+        """
+        Асинхронный вариант get_article_detail. Статистика автора загружается
+        вместе со статьей (select_related), страница комментариев - следующим
+        переходом в поток ORM.
+
+        Args:
+            article_id: ID статьи
+            comments_page: Номер страницы комментариев
+            comments_per_page: Количество комментариев на страницу
+            comments_order_by: Порядок сортировки комментариев
+
+        Returns:
+            Словарь со статьей, комментариями и информацией о пагинации комментариев
+        """
+        queryset = Article.objects.select_related(
+            "author", "author__stats"
+        ).prefetch_related(_card_categories_prefetch())
+        try:
+            article = await queryset.aget(id=article_id)
+        except Article.DoesNotExist:
+            raise Http404("Статья не найдена")
+
+        try:
+            author_total_articles = article.author.stats.total_articles
+        except AuthorStats.DoesNotExist:
+            stats = await UserDAO.aget_author_stats(article.author_id)
+            author_total_articles = stats["total_articles"]
+
+        comments = await CommentDAO.aget_comments_for_article(
+            article_id=article.id,
+            page=comments_page,
+            per_page=comments_per_page,
+            order_by=comments_order_by,
+            count=article.comment_count,
+        )
+
+        return {
+            "article": article,
+            "author_total_articles": author_total_articles,
+            **comments,
+        }
+
     @staticmethod
     def get_articles_without_comments(
-        page: int = 1, per_page: int = 10, order_by: str = "-created_at"
+        page: int = 1,
+        per_page: int = 10,
+        order_by: str = DEFAULT_SORT,
+        count_strategy: str = "exact",
     ) -> Dict[str, Any]:
         """
         Получить опубликованные статьи без комментариев
@@ -253,26 +571,29 @@ class ArticleDAO:
         Args:
             page: Номер страницы
             per_page: Количество статей на страницу
-            order_by: Поле для сортировки, по умолчанию сначала новые ("-created_at")
+            order_by: Режим сортировки (см. SORT_MODES), по умолчанию сначала новые
+            count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
 
         Returns:
             Словарь со статьями без комментариев и информацией о пагинации
         """
         queryset = (
-            Article.objects.filter(status="published", comments__isnull=True)
+            Article.objects.filter(status="published", comment_count=0)
             .select_related("author")
-            .distinct()
-            .order_by(order_by)
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
+            .order_by(*get_ordering(order_by))
         )
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        page_obj, total = paginate_queryset(
+            queryset, page=page, per_page=per_page, count_strategy=count_strategy
+        )
 
         return {
             "articles": page_obj.object_list,
             "page_obj": page_obj,
             "is_paginated": page_obj.has_other_pages(),
-            "total_articles": paginator.count,
+            "total_articles": total,
         }
 
     @staticmethod
@@ -291,9 +612,10 @@ class ArticleDAO:
         """
         return (
             Article.objects.select_related("author")
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
             .filter(status=status)
-            .annotate(comment_count=Count("comments"))
-            .order_by("-comment_count")[:limit]
+            .order_by(*SORT_MODES["commented"])[:limit]
         )
 
     @staticmethod
@@ -310,10 +632,97 @@ class ArticleDAO:
         """
         return (
             Article.objects.select_related("author")
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
             .filter(status=status)
-            .annotate(comment_count=Count("comments"))
-            .order_by("-created_at")[:limit]
+            .order_by(*SORT_MODES["newest"])[:limit]
+        )
+
+    @staticmethod
+    def get_article_state(article_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получить данные для проверки актуальности страницы статьи одним запросом:
+        время изменения статьи, время последнего комментария и их количество
+
+        Args:
+            article_id: ID статьи
+
+        Returns:
+            Словарь с полями updated_at, last_comment_at, comment_count, author_id
+            или None, если статьи нет
+        """
+        last_comment = (
+            Comment.objects.filter(article=OuterRef("pk"))
+            .order_by("-created_at")
+            .values("created_at")[:1]
         )
+        return (
+            Article.objects.filter(id=article_id)
+            .annotate(last_comment_at=Subquery(last_comment))
+            .values("updated_at", "last_comment_at", "comment_count", "author_id")
+            .first()
+        )
+
+    @staticmethod
+    def get_listing_state(
+        category_slug: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 10,
+        order_by: str = DEFAULT_SORT,
+        cursor: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_strategy: str = "exact",
+    ) -> Dict[str, Any]:
+        """
+        Получить состояние страницы списка опубликованных статей (ID, время
+        изменения и количество комментариев) без загрузки самих статей,
+        для проверки актуальности страницы
+
+        Args:
+            category_slug: Slug категории (если None - все опубликованные статьи)
+            page: Номер страницы
+            per_page: Количество статей на страницу
+            order_by: Режим сортировки (см. SORT_MODES)
+            cursor: Использовать курсорную пагинацию вместо номеров страниц
+            after: Токен курсора, после которого начинается страница
+            before: Токен курсора, перед которым заканчивается страница
+            count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
+
+        Returns:
+            Словарь со списком кортежей (id, author_id, updated_at, comment_count)
+            и общим количеством статей
+        """
+        ordering = get_ordering(order_by)
+        queryset = (
+            Article.objects.filter(status="published")
+            .only("id", "author_id", "created_at", "updated_at", "comment_count")
+            .order_by(*ordering)
+        )
+        if category_slug:
+            queryset = queryset.filter(categories__slug=category_slug)
+
+        page_obj, total = paginate_queryset(
+            queryset,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            after=after,
+            before=before,
+            order_by=ordering[0],
+            count_strategy=count_strategy,
+        )
+        rows = [
+            (article.id, article.author_id, article.updated_at, article.comment_count)
+            for article in page_obj
+        ]
+
+        return {
+            "articles": rows,
+            "has_next": page_obj.has_next(),
+            "has_previous": page_obj.has_previous(),
+            "total_articles": total,
+        }
 
     @staticmethod
     def get_article_comment_count(article_id: int) -> int:
@@ -326,7 +735,65 @@ class ArticleDAO:
         Returns:
             Количество комментариев
         """
-        return Comment.objects.filter(article_id=article_id).count()
+        return (
+            Article.objects.filter(id=article_id)
+            .values_list("comment_count", flat=True)
+            .first()
+            or 0
+        )
+
+    @staticmethod
+    def adjust_comment_count(article_id: int, delta: int) -> int:
+        """
+        Атомарно изменить счетчик комментариев статьи
+
+        Args:
+            article_id: ID статьи
+            delta: На сколько изменить счетчик (отрицательное значение уменьшает)
+
+        Returns:
+            Количество обновленных статей (0, если статья не найдена)
+        """
+        queryset = Article.objects.filter(id=article_id)
+
+        # Не даем счетчику уйти в минус при рассинхронизации
+        if delta < 0:
+            queryset = queryset.filter(comment_count__gte=-delta)
+
+        return queryset.update(comment_count=F("comment_count") + delta)
+
+    @staticmethod
+    def reconcile_comment_counts() -> int:
+        """
+        Пересчитать счетчики комментариев у статей, где они разошлись с фактическим
+        количеством комментариев
+
+        Returns:
+            Количество исправленных статей
+        """
+        actual_count = Coalesce(
+            Subquery(
+                Comment.objects.filter(article=OuterRef("pk"))
+                .order_by()
+                .values("article")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+
+        drifted_ids = list(
+            Article.objects.annotate(actual_count=actual_count)
+            .exclude(comment_count=F("actual_count"))
+            .values_list("id", flat=True)
+        )
+
+        if not drifted_ids:
+            return 0
+
+        return Article.objects.filter(id__in=drifted_ids).update(
+            comment_count=actual_count
+        )
 
     @staticmethod
     def get_articles_with_most_comments(limit: int = 5) -> List[Article]:
@@ -341,8 +808,9 @@ class ArticleDAO:
         """
         return (
             Article.objects.filter(status="published")
-            .annotate(comment_count=Count("comments"))
-            .order_by("-comment_count")[:limit]
+            .defer(*LIST_DEFERRED_FIELDS)
+            .prefetch_related(_card_categories_prefetch())
+            .order_by(*SORT_MODES["commented"])[:limit]
         )
 
     @staticmethod
@@ -371,7 +839,7 @@ class ArticleDAO:
             Созданная статья
         """
         with transaction.atomic():
-            article = Article.objects.create(
+            article = Article(
                 author_id=author_id,
                 title=title,
                 content=content,
@@ -379,6 +847,9 @@ class ArticleDAO:
                 image=image,
                 status=status,
             )
+            render_article(article)
+            article.save()
+            UserDAO.record_status_change(author_id, None, status)
 
             if category_ids:
                 article.categories.set(category_ids)
@@ -418,6 +889,7 @@ class ArticleDAO:
 
             if content is not None:
                 article.content = content
+                render_article(article)
 
             if source is not None:
                 article.source = source
@@ -425,6 +897,7 @@ class ArticleDAO:
             if image is not None:
                 article.image = image
 
+            old_status = article.status
             if status is not None:
                 article.status = status
 
@@ -432,6 +905,7 @@ class ArticleDAO:
                 article.categories.set(category_ids)
 
             article.save()
+            UserDAO.record_status_change(article.author_id, old_status, article.status)
             return article
 
     @staticmethod
@@ -445,10 +919,13 @@ class ArticleDAO:
         Returns:
             Архивированная статья
         """
-        article = get_object_or_404(Article, id=article_id)
-        article.status = "archived"
-        article.save()
-        return article
+        with transaction.atomic():
+            article = get_object_or_404(Article, id=article_id)
+            old_status = article.status
+            article.status = "archived"
+            article.save()
+            UserDAO.record_status_change(article.author_id, old_status, "archived")
+            return article
 
 
 class CategoryDAO:
@@ -503,6 +980,11 @@ class CommentDAO:
         page: int = 1,
         per_page: int = 20,
         order_by: str = "-created_at",
+        cursor: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_strategy: str = "exact",
+        count: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Получить комментарии для статьи с пагинацией
@@ -512,6 +994,11 @@ class CommentDAO:
             page: Номер страницы
             per_page: Количество комментариев на страницу
             order_by: Поле для сортировки, по умолчанию сначала новые ("-created_at")
+            cursor: Использовать курсорную пагинацию вместо номеров страниц
+            after: Токен курсора, после которого начинается страница
+            before: Токен курсора, перед которым заканчивается страница
+            count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
+            count: Заранее известное количество комментариев (например, comment_count статьи)
 
         Returns:
             Словарь с комментариями и информацией о пагинации
@@ -522,16 +1009,57 @@ class CommentDAO:
             .order_by(order_by)
         )
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        page_obj, total = paginate_queryset(
+            queryset,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            after=after,
+            before=before,
+            order_by=order_by,
+            count_strategy=count_strategy,
+            count=count,
+        )
 
         return {
             "comments": page_obj.object_list,
             "page_obj": page_obj,
             "is_paginated": page_obj.has_other_pages(),
-            "total_comments": paginator.count,
+            "total_comments": total,
         }
 
+    @staticmethod
+    async def aget_comments_for_article(
+        article_id: int,
+        page: int = 1,
+        per_page: int = 20,
+        order_by: str = "-created_at",
+        cursor: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_strategy: str = "exact",
+        count: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Асинхронный вариант get_comments_for_article (аргументы те же)
+
+        Returns:
+            Словарь с комментариями (уже загруженными) и информацией о пагинации
+        """
+        return await sync_to_async(_load_page)(
+            CommentDAO.get_comments_for_article,
+            "comments",
+            article_id=article_id,
+            page=page,
+            per_page=per_page,
+            order_by=order_by,
+            cursor=cursor,
+            after=after,
+            before=before,
+            count_strategy=count_strategy,
+            count=count,
+        )
+
     @staticmethod
     def get_recent_comments(limit: int = 5) -> List[Comment]:
         """
@@ -560,11 +1088,15 @@ class CommentDAO:
         Returns:
             Созданный комментарий
         """
-        article = get_object_or_404(Article, id=article_id)
+        with transaction.atomic():
+            if not ArticleDAO.adjust_comment_count(article_id, 1):
+                raise Http404("Статья не найдена")
 
-        return Comment.objects.create(
-            article=article, author_id=author_id, content=content
-        )
+            comment = Comment.objects.create(
+                article_id=article_id, author_id=author_id, content=content
+            )
+            UserDAO.adjust_author_stats(author_id, comments_count=1)
+            return comment
 
     @staticmethod
     def delete_comment(comment_id: int) -> bool:
@@ -577,8 +1109,11 @@ class CommentDAO:
         Returns:
             True если комментарий успешно удален
         """
-        comment = get_object_or_404(Comment, id=comment_id)
-        comment.delete()
+        with transaction.atomic():
+            comment = get_object_or_404(Comment, id=comment_id)
+            comment.delete()
+            ArticleDAO.adjust_comment_count(comment.article_id, -1)
+            UserDAO.adjust_author_stats(comment.author_id, comments_count=-1)
         return True
 
 
@@ -599,19 +1134,16 @@ class UserDAO:
             Список авторов с информацией о количестве статей
         """
         return (
-            User.objects.annotate(
-                published_articles=Count(
-                    "articles", filter=Q(articles__status="published")
-                )
-            )
-            .filter(published_articles__gt=0)
-            .order_by("-published_articles")[:limit]
+            User.objects.filter(stats__published_count__gt=0)
+            .annotate(published_articles=F("stats__published_count"))
+            .order_by("-stats__published_count")[:limit]
         )
 
     @staticmethod
     def get_author_stats(author_id: int) -> Dict[str, int]:
         """
-        Получить статистику автора по статьям
+        Получить статистику автора по статьям из AuthorStats.
+        Если записи еще нет, она вычисляется и сохраняется.
 
         Args:
             author_id: ID автора
@@ -619,26 +1151,136 @@ class UserDAO:
         Returns:
             Словарь со статистикой
         """
-        author = get_object_or_404(User, id=author_id)
+        stats = AuthorStats.objects.filter(author_id=author_id).first()
+        if stats is None:
+            UserDAO.rebuild_author_stats([author_id])
+            stats = AuthorStats.objects.filter(
+                author_id=author_id
+            ).first() or AuthorStats(author_id=author_id)
+
+        return {
+            "published_count": stats.published_count,
+            "moderated_count": stats.moderated_count,
+            "rejected_count": stats.rejected_count,
+            "archived_count": stats.archived_count,
+            "total_articles": stats.total_articles,
+            "comments_count": stats.comments_count,
+        }
 
-        published_count = Article.objects.filter(
-            author=author, status="published"
-        ).count()
+    @staticmethod
+    async def aget_author_stats(author_id: int) -> Dict[str, int]:
+        """
+        Асинхронный вариант get_author_stats
 
-        moderated_count = Article.objects.filter(
-            author=author, status="moderated"
-        ).count()
+        Args:
+            author_id: ID автора
 
-        rejected_count = Article.objects.filter(
-            author=author, status="rejected"
-        ).count()
+        Returns:
+            Словарь со статистикой
+        """
+        return await sync_to_async(UserDAO.get_author_stats)(author_id)
 
-        comments_count = Comment.objects.filter(author=author).count()
+    @staticmethod
+    def adjust_author_stats(author_id: int, **deltas: int) -> None:
+        """
+        Атомарно изменить счетчики статистики автора. Если записи статистики
+        еще нет, она вычисляется заново (с учетом уже выполненных изменений).
 
-        return {
-            "published_count": published_count,
-            "moderated_count": moderated_count,
-            "rejected_count": rejected_count,
-            "total_articles": published_count + moderated_count + rejected_count,
-            "comments_count": comments_count,
+        Args:
+            author_id: ID автора
+            deltas: Изменения счетчиков, например comments_count=1
+        """
+        updates = {
+            field: Greatest(F(field) + delta, 0)
+            for field, delta in deltas.items()
+            if delta
         }
+        if not updates:
+            return
+
+        if not AuthorStats.objects.filter(author_id=author_id).update(**updates):
+            UserDAO.rebuild_author_stats([author_id])
+
+    @staticmethod
+    def record_status_change(
+        author_id: int, old_status: Optional[str], new_status: Optional[str]
+    ) -> None:
+        """
+        Учесть в статистике автора переход статьи между статусами
+
+        Args:
+            author_id: ID автора
+            old_status: Прежний статус (None для новой статьи)
+            new_status: Новый статус (None для удаленной статьи)
+        """
+        if old_status == new_status:
+            return
+
+        deltas = {}
+        if old_status is not None:
+            deltas[f"{old_status}_count"] = -1
+        if new_status is not None:
+            deltas[f"{new_status}_count"] = 1
+
+        UserDAO.adjust_author_stats(author_id, **deltas)
+
+    @staticmethod
+    def rebuild_author_stats(author_ids: Optional[List[int]] = None) -> int:
+        """
+        Пересчитать статистику авторов, где она разошлась с фактическими данными,
+        и создать недостающие записи
+
+        Args:
+            author_ids: ID авторов для пересчета (если None - все пользователи)
+
+        Returns:
+            Количество исправленных записей
+        """
+        users = User.objects.all()
+        if author_ids is not None:
+            users = users.filter(id__in=author_ids)
+
+        AuthorStats.objects.bulk_create(
+            [
+                AuthorStats(author_id=user_id)
+                for user_id in users.filter(stats__isnull=True).values_list(
+                    "id", flat=True
+                )
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+        def actual_count(model, **filters):
+            return Coalesce(
+                Subquery(
+                    model.objects.filter(author=OuterRef("author"), **filters)
+                    .order_by()
+                    .values("author")
+                    .annotate(count=Count("pk"))
+                    .values("count")
+                ),
+                0,
+            )
+
+        actual = {
+            f"{status}_count": actual_count(Article, status=status)
+            for status in ARTICLE_STATUSES
+        }
+        actual["comments_count"] = actual_count(Comment)
+
+        drifted = Q()
+        for field in actual:
+            drifted |= ~Q(**{field: F(f"actual_{field}")})
+
+        drifted_ids = list(
+            AuthorStats.objects.filter(author__in=users)
+            .annotate(**{f"actual_{field}": value for field, value in actual.items()})
+            .filter(drifted)
+            .values_list("author_id", flat=True)
+        )
+
+        if not drifted_ids:
+            return 0
+
+        return AuthorStats.objects.filter(author_id__in=drifted_ids).update(**actual)
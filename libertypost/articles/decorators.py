@@ -1,9 +1,26 @@
-from functools import wraps
-from typing import Callable
+from contextlib import ExitStack
+from functools import partial, wraps
+from typing import Callable, List, Optional
 
-from django.http import HttpRequest
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators import http
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from core.uploads import ValidatingImageUploadHandler
+
+from . import page_cache
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Представление выполнило больше SQL-запросов, чем заявлено в его бюджете
+    """
 
 
 def admin_required(view_func: Callable) -> Callable:
@@ -20,3 +37,205 @@ def admin_required(view_func: Callable) -> Callable:
             return redirect(reverse("articles:articles"))
 
     return _wrapped_view
+
+
+def validated_image_uploads(view_func: Callable) -> Callable:
+    """
+    Декоратор, который принимает файлы запроса через ValidatingImageUploadHandler
+    (потоково, с проверкой формата и размеров изображения). Обработчики загрузки
+    нельзя заменить после чтения request.POST, а CsrfViewMiddleware читает его
+    до вызова представления, поэтому проверка CSRF переносится внутрь декоратора.
+    Причины отклонения файлов - в request.upload_errors.
+    """
+    protected_view = csrf_protect(view_func)
+
+    @wraps(view_func)
+    def _wrapped_view(request: HttpRequest, *args, **kwargs):
+        request.upload_handlers = [ValidatingImageUploadHandler(request)]
+        return protected_view(request, *args, **kwargs)
+
+    return csrf_exempt(_wrapped_view)
+
+
+def _count_queries(stack: ExitStack, executed: List[str]) -> None:
+    """
+    Записывать SQL-запросы всех соединений текущего потока в executed,
+    пока открыт stack
+    """
+
+    def count_query(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(count_query))
+
+
+def _budget_enforced(request: HttpRequest) -> bool:
+    if request.method not in ("GET", "HEAD"):
+        return False
+    return getattr(settings, "QUERY_BUDGET_ENFORCED", settings.DEBUG)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Декоратор, который ограничивает количество SQL-запросов представления
+    (включая запросы при отрисовке шаблона и контекстных процессоров).
+    Проверка включена, если QUERY_BUDGET_ENFORCED = True (по умолчанию в режиме
+    отладки), и при превышении бюджета выбрасывается QueryBudgetExceeded.
+    Асинхронные представления тоже поддерживаются: их запросы выполняются в потоке
+    sync_to_async, поэтому счетчик подключается к соединениям этого потока.
+    Бюджет относится к чтению: запросы с записью (POST и другие небезопасные
+    методы) не проверяются.
+
+    Args:
+        max_queries: Максимальное количество запросов на один вызов
+    """
+
+    def check(view_func: Callable, executed: List[str]) -> None:
+        if len(executed) > max_queries:
+            raise QueryBudgetExceeded(
+                f"{view_func.__name__}: выполнено {len(executed)} запросов "
+                f"при бюджете {max_queries}:\n" + "\n".join(executed)
+            )
+
+    def decorator(view_func: Callable) -> Callable:
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def _async_wrapped_view(request: HttpRequest, *args, **kwargs):
+                if not _budget_enforced(request):
+                    return await view_func(request, *args, **kwargs)
+
+                executed = []
+                stack = ExitStack()
+                await sync_to_async(_count_queries)(stack, executed)
+                try:
+                    response = await view_func(request, *args, **kwargs)
+                finally:
+                    await sync_to_async(stack.close)()
+
+                check(view_func, executed)
+                return response
+
+            return _async_wrapped_view
+
+        @wraps(view_func)
+        def _wrapped_view(request: HttpRequest, *args, **kwargs):
+            if not _budget_enforced(request):
+                return view_func(request, *args, **kwargs)
+
+            executed = []
+            with ExitStack() as stack:
+                _count_queries(stack, executed)
+                response = view_func(request, *args, **kwargs)
+
+            check(view_func, executed)
+            return response
+
+        return _wrapped_view
+
+    return decorator
+
+
+def anonymous_page_cache(
+    view_func: Optional[Callable] = None, *, tags: Optional[Callable] = None
+) -> Callable:
+    """
+    Декоратор, который отдает анонимным читателям закешированную страницу.
+    Страница сбрасывается по тегам, которыми ее помечает представление
+    через page_cache.add_cache_tags (см. articles.page_cache).
+
+    Args:
+        view_func: Представление (если декоратор применяется без аргументов)
+        tags: Функция (request, *args, **kwargs) -> теги, известные по URL.
+            Их версии читаются до загрузки данных, и если запись изменила
+            их во время отрисовки, страница не сохраняется
+    """
+    if view_func is None:
+        return partial(anonymous_page_cache, tags=tags)
+
+    def initial_tags(request: HttpRequest, *args, **kwargs):
+        return tags(request, *args, **kwargs) if tags else ()
+
+    def finalize(request: HttpRequest, response: HttpResponse, versions) -> None:
+        # Страница для анонимного читателя не должна попасть к вошедшему через прокси
+        patch_vary_headers(response, ("Cookie",))
+        page_cache.store(request, response, versions)
+
+    if iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def _async_wrapped_view(request: HttpRequest, *args, **kwargs):
+            if not page_cache.is_cacheable_request(request):
+                return await view_func(request, *args, **kwargs)
+
+            # Бэкенд кеша может быть синхронным (например, DatabaseCache)
+            response = await sync_to_async(page_cache.get)(request)
+            if response is not None:
+                return response
+
+            versions = await sync_to_async(page_cache.start)(
+                request, initial_tags(request, *args, **kwargs)
+            )
+            response = await view_func(request, *args, **kwargs)
+            await sync_to_async(finalize)(request, response, versions)
+            return response
+
+        return _async_wrapped_view
+
+    @wraps(view_func)
+    def _wrapped_view(request: HttpRequest, *args, **kwargs):
+        if not page_cache.is_cacheable_request(request):
+            return view_func(request, *args, **kwargs)
+
+        response = page_cache.get(request)
+        if response is not None:
+            return response
+
+        versions = page_cache.start(request, initial_tags(request, *args, **kwargs))
+        response = view_func(request, *args, **kwargs)
+        finalize(request, response, versions)
+        return response
+
+    return _wrapped_view
+
+
+def condition(etag_func=None, last_modified_func=None) -> Callable:
+    """
+    Декоратор django.views.decorators.http.condition, который для асинхронных
+    представлений вычисляет ETag и Last-Modified в потоке через sync_to_async:
+    функции валидаторов обращаются к базе данных и к request.user, а Django
+    вызывает их прямо в цикле событий.
+
+    Args:
+        etag_func: Функция, возвращающая ETag
+        last_modified_func: Функция, возвращающая дату последнего изменения
+    """
+
+    def decorator(view_func: Callable) -> Callable:
+        if not iscoroutinefunction(view_func):
+            return http.condition(etag_func, last_modified_func)(view_func)
+
+        # Пустой ответ 200 означает, что валидаторы не совпали и страницу нужно
+        # отрисовать; заголовки ETag и Last-Modified переносятся в настоящий ответ
+        validate = http.condition(etag_func, last_modified_func)(
+            lambda request, *args, **kwargs: HttpResponse()
+        )
+
+        @wraps(view_func)
+        async def _async_wrapped_view(request: HttpRequest, *args, **kwargs):
+            validated = await sync_to_async(validate)(request, *args, **kwargs)
+            if validated.status_code != 200:
+                return validated
+
+            response = await view_func(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                for header in ("ETag", "Last-Modified"):
+                    if header in validated.headers:
+                        response.headers.setdefault(header, validated.headers[header])
+            return response
+
+        return _async_wrapped_view
+
+    return decorator
@@ -0,0 +1,94 @@
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from articles.dao import ArticleDAO
+from articles.models import Article
+from core.benchmarks import benchmark_database, measure, seed_dataset
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк страницы статьи: количество запросов и время ответа
+    для статей с тысячами комментариев.
+    """
+
+    help = "Замерить количество запросов и время страницы статьи"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=1_000)
+        parser.add_argument("--comments", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with benchmark_database():
+                self.stdout.write("Заполнение базы...")
+                data = seed_dataset(
+                    articles=options["articles"], comments=options["comments"]
+                )
+                results = self._run(data, options["repeat"])
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(f"База данных: {connection.vendor}")
+        self.stdout.write(
+            f"{'Сценарий':<32} {'комментариев':>13} {'медиана, мс':>12} "
+            f"{'запросов':>9}"
+        )
+        for name, comments, result in results:
+            self.stdout.write(
+                f"{name:<32} {comments:>13} {result['median_ms']:>12.2f} "
+                f"{result['queries']:>9}"
+            )
+
+    @staticmethod
+    def _run(data, repeat: int):
+        client = Client(HTTP_HOST="localhost")
+        hot_article = (
+            Article.objects.filter(id__in=data["hot_articles"])
+            .order_by("-comment_count")
+            .first()
+        )
+        url = reverse("articles:article", args=[hot_article.id])
+        last_page = max(1, (hot_article.comment_count + 19) // 20)
+
+        # Первый запрос прогревает кеш контекстных процессоров
+        client.get(url)
+
+        return [
+            (
+                "loader: page 1",
+                hot_article.comment_count,
+                measure(
+                    lambda: list(
+                        ArticleDAO.get_article_detail(hot_article.id)["comments"]
+                    ),
+                    repeat=repeat,
+                ),
+            ),
+            (
+                "async loader: page 1",
+                hot_article.comment_count,
+                measure(
+                    lambda: async_to_sync(ArticleDAO.aget_article_detail)(
+                        hot_article.id
+                    ),
+                    repeat=repeat,
+                ),
+            ),
+            (
+                "view: page 1",
+                hot_article.comment_count,
+                measure(lambda: client.get(url), repeat=repeat),
+            ),
+            (
+                "view: last page",
+                hot_article.comment_count,
+                measure(lambda: client.get(url, {"page": last_page}), repeat=repeat),
+            ),
+        ]
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.test import RequestFactory
+
+from articles.dao import ArticleDAO
+from core.benchmarks import benchmark_database, measure, seed_dataset
+
+PAGE_TEMPLATE = (
+    "{% for article in articles %}"
+    '{% include "articles/includes/article_card.html" %}'
+    "{% endfor %}"
+)
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк отрисовки страницы из карточек статей с пустым (cold)
+    и заполненным (warm) кешем фрагментов.
+    """
+
+    help = "Замерить отрисовку карточек статей с кешем фрагментов и без него"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cards", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            seed_dataset(
+                authors=20, categories=10, articles=options["cards"] * 10, comments=500
+            )
+            articles = list(
+                ArticleDAO.get_articles_with_comment_count(per_page=options["cards"])[
+                    "articles"
+                ]
+            )
+
+            request = RequestFactory().get("/articles/", HTTP_HOST="localhost")
+            template = Template(PAGE_TEMPLATE)
+
+            def render():
+                return template.render(
+                    Context({"articles": articles, "request": request})
+                )
+
+            results = {
+                "cold": measure(render, repeat=options["repeat"], setup=cache.clear),
+                "warm": measure(render, repeat=options["repeat"], setup=render),
+            }
+
+        self.stdout.write(f"Карточек на странице: {len(articles)}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<6} медиана {result['median_ms']:.2f} мс, "
+                f"минимум {result['min_ms']:.2f} мс, запросов {result['queries']}"
+            )
+        speedup = results["cold"]["median_ms"] / max(results["warm"]["median_ms"], 1e-6)
+        self.stdout.write(self.style.SUCCESS(f"Ускорение: x{speedup:.1f}"))
@@ -0,0 +1,138 @@
+import statistics
+import threading
+import time
+from copy import deepcopy
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+from articles.dao import ArticleDAO
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный бенчмарк соединений с базой данных: потоки выполняют "запросы"
+    (сигналы request_started / request_finished, как в обработчике Django,
+    и запросы валидатора ленты) с новым соединением на каждый запрос,
+    с постоянными соединениями (CONN_MAX_AGE) и с пулом psycopg 3.
+    Команда только читает данные настроенной базы.
+    """
+
+    help = "Сравнить время запросов с новыми, постоянными соединениями и пулом"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--pool-size", type=int, default=4)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        settings_dict = connections[alias].settings_dict
+        original = deepcopy(settings_dict)
+
+        modes = [
+            ("новое соединение на запрос", {"CONN_MAX_AGE": 0}),
+            ("постоянные соединения", {"CONN_MAX_AGE": 60}),
+        ]
+        if connections[alias].vendor == "postgresql" and self._pool_available():
+            pool_options = {**original.get("OPTIONS", {})}
+            pool_options["pool"] = {
+                "min_size": options["pool_size"],
+                "max_size": options["pool_size"],
+            }
+            modes.append(
+                ("пул psycopg 3", {"CONN_MAX_AGE": 0, "OPTIONS": pool_options})
+            )
+        else:
+            self.stdout.write(
+                "Пул соединений доступен только для PostgreSQL с psycopg 3"
+            )
+
+        self.stdout.write(
+            f"База данных: {connections[alias].vendor}, "
+            f"запросов: {options['requests']}, потоков: {options['concurrency']}"
+        )
+        self.stdout.write(
+            f"{'Режим':<28} {'медиана, мс':>12} {'p95, мс':>9} "
+            f"{'запросов/с':>11} {'соединений':>11}"
+        )
+        try:
+            for name, overrides in modes:
+                settings_dict.update(overrides)
+                result = self._run(alias, options["requests"], options["concurrency"])
+                if "pool" in overrides.get("OPTIONS", {}):
+                    # С пулом connection_created срабатывает при каждой выдаче
+                    # соединения из пула, реально открытые соединения считает пул
+                    stats = connections[alias].pool.get_stats()
+                    result["connections"] = stats.get("connections_num", 0)
+                    connections[alias].close_pool()
+                self.stdout.write(
+                    f"{name:<28} {result['median_ms']:>12.2f} {result['p95_ms']:>9.2f} "
+                    f"{result['rps']:>11.0f} {result['connections']:>11}"
+                )
+        finally:
+            settings_dict.clear()
+            settings_dict.update(original)
+
+    @staticmethod
+    def _pool_available() -> bool:
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def _run(alias: str, requests: int, concurrency: int):
+        lock = threading.Lock()
+        durations = []
+        opened = []
+        remaining = [requests]
+
+        def count_connection(sender, connection, **kwargs):
+            if connection.alias == alias:
+                with lock:
+                    opened.append(connection)
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        if not remaining[0]:
+                            return
+                        remaining[0] -= 1
+
+                    started = time.perf_counter()
+                    # Как в обработчике запросов: close_old_connections до и после
+                    request_started.send(sender=WSGIHandler)
+                    ArticleDAO.get_listing_state(cursor=True)
+                    request_finished.send(sender=WSGIHandler)
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        durations.append(elapsed)
+            finally:
+                connections.close_all()
+
+        connection_created.connect(count_connection)
+        try:
+            started = time.perf_counter()
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            total = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(count_connection)
+
+        durations.sort()
+        return {
+            "median_ms": statistics.median(durations) * 1000,
+            "p95_ms": durations[int(len(durations) * 0.95) - 1] * 1000,
+            "rps": len(durations) / total,
+            "connections": len(opened),
+        }
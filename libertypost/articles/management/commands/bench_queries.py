@@ -0,0 +1,153 @@
+import json
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from articles.dao import ArticleDAO, CommentDAO, UserDAO
+from articles.models import Article, Comment
+from articles.pagination import encode_cursor
+from core.benchmarks import (
+    analyze_database,
+    benchmark_database,
+    explain,
+    measure,
+    seed_dataset,
+)
+
+
+@contextmanager
+def _model_indexes(enabled: bool):
+    """
+    Временно удалить индексы из Meta моделей, чтобы замерить запросы без них
+    """
+    if enabled:
+        yield
+        return
+
+    with connection.schema_editor() as editor:
+        for model in (Article, Comment):
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+    analyze_database()
+
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model in (Article, Comment):
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+        analyze_database()
+
+
+def _evaluate(result):
+    """
+    Принудительно выполнить ленивые запросы результата DAO
+    """
+    if isinstance(result, dict):
+        for key in ("articles", "comments"):
+            if key in result:
+                list(result[key])
+    else:
+        list(result)
+    return result
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк запросов ArticleDAO/CommentDAO на синтетических данных.
+    Замеряет время и планы запросов с индексами из Meta моделей и без них.
+    """
+
+    help = "Замерить время и планы запросов DAO с индексами и без них"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=20_000)
+        parser.add_argument("--comments", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--plans", action="store_true", help="Выводить планы запросов"
+        )
+        parser.add_argument("--output", help="Сохранить результаты в JSON-файл")
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.stdout.write("Заполнение базы...")
+            data = seed_dataset(
+                articles=options["articles"], comments=options["comments"]
+            )
+            scenarios = self._scenarios(data)
+
+            results = {"vendor": connection.vendor, "scenarios": {}}
+            for label, indexed in (("after", True), ("before", False)):
+                with _model_indexes(indexed):
+                    for name, func in scenarios.items():
+                        entry = results["scenarios"].setdefault(name, {})
+                        entry[label] = measure(func, repeat=options["repeat"])
+                        if options["plans"] or options["output"]:
+                            entry[f"{label}_plans"] = explain(func)
+
+        self._report(results, options["plans"])
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _scenarios(data):
+        published = Article.objects.filter(status="published").order_by(
+            "-created_at", "-id"
+        )
+        middle = published[published.count() // 2]
+        deep_cursor = encode_cursor(middle.created_at, middle.pk)
+        author_id = data["users"][0]
+        hot_article = data["hot_articles"][0]
+        category_slug = "bench-0"
+
+        return {
+            "feed: page 1": lambda: _evaluate(
+                ArticleDAO.get_articles_with_comment_count(page=1)
+            ),
+            "feed: deep page": lambda: _evaluate(
+                ArticleDAO.get_articles_with_comment_count(page=500)
+            ),
+            "feed: deep cursor": lambda: _evaluate(
+                ArticleDAO.get_articles_with_comment_count(
+                    cursor=True, after=deep_cursor
+                )
+            ),
+            "category": lambda: _evaluate(
+                ArticleDAO.get_articles_by_category(category_slug)
+            ),
+            "author": lambda: _evaluate(
+                ArticleDAO.get_articles_by_author(author_id, status="published")
+            ),
+            "search": lambda: _evaluate(ArticleDAO.search_articles("котики")),
+            "popular": lambda: _evaluate(ArticleDAO.get_popular_articles()),
+            "without comments": lambda: _evaluate(
+                ArticleDAO.get_articles_without_comments()
+            ),
+            "article by id": lambda: ArticleDAO.get_article_by_id(hot_article),
+            "comments": lambda: _evaluate(
+                CommentDAO.get_comments_for_article(hot_article)
+            ),
+            "author stats": lambda: UserDAO.get_author_stats(author_id),
+        }
+
+    def _report(self, results, show_plans: bool):
+        self.stdout.write(f"База данных: {results['vendor']}")
+        self.stdout.write(
+            f"{'Сценарий':<20} {'без индексов, мс':>18} {'с индексами, мс':>18} "
+            f"{'запросов':>9}"
+        )
+        for name, entry in results["scenarios"].items():
+            self.stdout.write(
+                f"{name:<20} {entry['before']['median_ms']:>18.2f} "
+                f"{entry['after']['median_ms']:>18.2f} "
+                f"{entry['after']['queries']:>9}"
+            )
+            if show_plans:
+                for label in ("before", "after"):
+                    for plan in entry[f"{label}_plans"]:
+                        self.stdout.write(f"  [{label}] {plan['plan']}")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from articles.dao import UserDAO
+
+
+class Command(BaseCommand):
+    """
+    Команда для пересчета статистики авторов (например, после каскадного
+    удаления пользователей или массового импорта статей)
+    """
+
+    help = "Пересчитать статистику авторов"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "author_ids", nargs="*", type=int, help="ID авторов (по умолчанию все)"
+        )
+
+    def handle(self, *args, **options):
+        fixed = UserDAO.rebuild_author_stats(options["author_ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Исправлено записей: {fixed}"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from articles.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Команда для полной перестройки полнотекстового индекса статей
+    (например, после массового импорта через bulk_create, минуя сигналы)
+    """
+
+    help = "Перестроить полнотекстовый индекс статей"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        with transaction.atomic(using=options["database"]):
+            indexed = get_search_backend(options["database"]).rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Проиндексировано статей: {indexed}"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from articles.dao import ArticleDAO
+
+
+class Command(BaseCommand):
+    """
+    Команда для исправления расхождений в счетчиках комментариев статей
+    (например, после каскадного удаления пользователей)
+    """
+
+    help = "Пересчитать счетчики комментариев статей"
+
+    def handle(self, *args, **options):
+        fixed = ArticleDAO.reconcile_comment_counts()
+        self.stdout.write(self.style.SUCCESS(f"Исправлено статей: {fixed}"))
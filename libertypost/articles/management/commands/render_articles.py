@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from articles.models import Article
+from articles.page_cache import invalidate_tags
+from articles.rendering import render_article
+
+
+class Command(BaseCommand):
+    """
+    Команда для заполнения и перерисовки сохраненного HTML и превью статей.
+    Перерисовываются только статьи, у которых хеш содержимого устарел
+    (например, после изменения MARKDOWN_EXTENSIONS). bulk_update не вызывает
+    сигналы, поэтому у перерисованных статей обновляется updated_at (ключ кеша
+    карточек) и сбрасываются закешированные страницы с ними.
+    """
+
+    help = "Перерисовать сохраненный HTML статей из Markdown"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перерисовать все статьи, даже если хеш совпадает",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Количество статей, обновляемых одним запросом",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Article.objects.only("id", "content", "content_hash").order_by("id")
+
+        batch = []
+        total = 0
+
+        for article in queryset.iterator(chunk_size=batch_size):
+            if render_article(article, force=options["force"]):
+                batch.append(article)
+
+            if len(batch) >= batch_size:
+                total += self._flush(batch)
+
+        total += self._flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Перерисовано статей: {total}"))
+
+    @staticmethod
+    def _flush(batch) -> int:
+        count = len(batch)
+        if batch:
+            now = timezone.now()
+            for article in batch:
+                article.updated_at = now
+            Article.objects.bulk_update(
+                batch, ["content_html", "excerpt_html", "content_hash", "updated_at"]
+            )
+            invalidate_tags(
+                "feed",
+                *(f"article:{article.pk}" for article in batch),
+                replicated=True,
+            )
+            batch.clear()
+        return count
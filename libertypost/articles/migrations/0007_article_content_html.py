@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+from articles.rendering import render_markdown
+
+
+def fill_content_html(apps, schema_editor):
+    # Хеш заполняет 0008 вместе с превью, иначе превью считалось бы актуальным
+    Article = apps.get_model("articles", "Article")
+
+    batch = []
+    for article in Article.objects.only("id", "content").iterator(chunk_size=500):
+        article.content_html = render_markdown(article.content)
+        batch.append(article)
+        if len(batch) >= 500:
+            Article.objects.bulk_update(batch, ["content_html"])
+            batch.clear()
+    Article.objects.bulk_update(batch, ["content_html"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_alter_article_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Статья (HTML)'),
+        ),
+        migrations.RunPython(fill_content_html, migrations.RunPython.noop),
+    ]
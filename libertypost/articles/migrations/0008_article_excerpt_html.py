@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+from articles.rendering import get_content_hash, render_excerpt
+
+
+def fill_excerpt_html(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+
+    batch = []
+    for article in Article.objects.only("id", "content").iterator(chunk_size=500):
+        article.excerpt_html = render_excerpt(article.content)
+        article.content_hash = get_content_hash(article.content)
+        batch.append(article)
+        if len(batch) >= 500:
+            Article.objects.bulk_update(batch, ["excerpt_html", "content_hash"])
+            batch.clear()
+    Article.objects.bulk_update(batch, ["excerpt_html", "content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_article_content_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='excerpt_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Превью (HTML)'),
+        ),
+        migrations.RunPython(fill_excerpt_html, migrations.RunPython.noop),
+    ]
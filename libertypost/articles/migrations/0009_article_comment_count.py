@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:13
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+    Comment = apps.get_model("articles", "Comment")
+
+    Article.objects.update(
+        comment_count=Coalesce(
+            Subquery(
+                Comment.objects.filter(article=OuterRef("pk"))
+                .order_by()
+                .values("article")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0008_article_excerpt_html"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Комментарии"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["status", "-comment_count"], name="article_status_comments_idx"
+            ),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_author_stats(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    Article = apps.get_model("articles", "Article")
+    Comment = apps.get_model("articles", "Comment")
+    AuthorStats = apps.get_model("articles", "AuthorStats")
+
+    stats = {
+        user_id: AuthorStats(author_id=user_id)
+        for user_id in User.objects.values_list("id", flat=True)
+    }
+
+    articles = (
+        Article.objects.order_by()
+        .values_list("author_id", "status")
+        .annotate(count=Count("pk"))
+    )
+    for author_id, status, count in articles:
+        setattr(stats[author_id], f"{status}_count", count)
+
+    comments = (
+        Comment.objects.order_by().values_list("author_id").annotate(count=Count("pk"))
+    )
+    for author_id, count in comments:
+        stats[author_id].comments_count = count
+
+    AuthorStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0002_alter_user_image"),
+        ("articles", "0010_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuthorStats",
+            fields=[
+                (
+                    "author",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Автор",
+                    ),
+                ),
+                (
+                    "published_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Опубликовано"),
+                ),
+                (
+                    "moderated_count",
+                    models.PositiveIntegerField(default=0, verbose_name="В модерации"),
+                ),
+                (
+                    "rejected_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Отклонено"),
+                ),
+                (
+                    "archived_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Архивированно"
+                    ),
+                ),
+                (
+                    "comments_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Комментарии"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Статистика автора",
+                "verbose_name_plural": "Статистика авторов",
+                "indexes": [
+                    models.Index(
+                        fields=["-published_count"], name="author_stats_published_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE articles_article ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX article_search_vector_idx ON articles_article "
+    "USING gin (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS article_search_vector_idx",
+    "ALTER TABLE articles_article DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE articles_article_fts USING fts5("
+    "title, content, tokenize = 'unicode61 remove_diacritics 2')",
+    "INSERT INTO articles_article_fts (rowid, title, content) "
+    "SELECT id, title, content FROM articles_article WHERE status = 'published'",
+]
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS articles_article_fts"]
+
+
+def _execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _execute(schema_editor, POSTGRES_FORWARD)
+    elif vendor == "sqlite":
+        _execute(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _execute(schema_editor, POSTGRES_BACKWARD)
+    elif vendor == "sqlite":
+        _execute(schema_editor, SQLITE_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0011_authorstats"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0012_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_status_comments_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="article",
+            name="article_author_status_idx",
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["author", "status", "-created_at", "-id"],
+                name="article_author_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["status", "-comment_count", "-id"],
+                name="article_status_comments_idx",
+            ),
+        ),
+    ]
@@ -14,6 +14,15 @@ class Article(models.Model):
         "Category", related_name="articles", verbose_name="Категории"
     )
     content = models.TextField(verbose_name="Статья")
+    content_html = models.TextField(
+        blank=True, default="", editable=False, verbose_name="Статья (HTML)"
+    )
+    excerpt_html = models.TextField(
+        blank=True, default="", editable=False, verbose_name="Превью (HTML)"
+    )
+    content_hash = models.CharField(
+        max_length=64, blank=True, default="", editable=False
+    )
     status = models.CharField(
         max_length=10,
         choices=[
@@ -34,6 +43,11 @@ class Article(models.Model):
         null=True,
         verbose_name="Изображение",
     )
+    # Уменьшенные копии изображения (см. core/images.py)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Комментарии"
+    )
     rejection_reason = models.TextField(
         verbose_name="Причина отклонения", blank=True, null=True
     )
@@ -44,6 +58,29 @@ class Article(models.Model):
         # ordering = ["-created_at"]
         verbose_name = "Статья"
         verbose_name_plural = "Статьи"
+        indexes = [
+            # Ленты по статусу с сортировкой по дате (и курсорная пагинация)
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="article_status_created_idx",
+            ),
+            # Публичные ленты: только опубликованные статьи
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(status="published"),
+                name="article_published_created_idx",
+            ),
+            # Профиль автора: статьи автора с фильтром по статусу
+            models.Index(
+                fields=["author", "status", "-created_at", "-id"],
+                name="article_author_status_idx",
+            ),
+            # Сортировка "commented" (см. articles.sorting)
+            models.Index(
+                fields=["status", "-comment_count", "-id"],
+                name="article_status_comments_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -89,6 +126,55 @@ class Comment(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = [
+            models.Index(
+                fields=["article", "-created_at"],
+                name="comment_article_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.article}"
+
+
+class AuthorStats(models.Model):
+    """
+    Материализованная статистика автора. Обновляется инкрементально при смене
+    статуса статей и создании/удалении комментариев, пересчитывается командой
+    rebuild_author_stats.
+    """
+
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name="Автор",
+    )
+    published_count = models.PositiveIntegerField(
+        default=0, verbose_name="Опубликовано"
+    )
+    moderated_count = models.PositiveIntegerField(default=0, verbose_name="В модерации")
+    rejected_count = models.PositiveIntegerField(default=0, verbose_name="Отклонено")
+    archived_count = models.PositiveIntegerField(
+        default=0, verbose_name="Архивированно"
+    )
+    comments_count = models.PositiveIntegerField(default=0, verbose_name="Комментарии")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Статистика автора"
+        verbose_name_plural = "Статистика авторов"
+        indexes = [
+            # Топ авторов по количеству опубликованных статей
+            models.Index(
+                fields=["-published_count"], name="author_stats_published_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Stats of {self.author_id}"
+
+    @property
+    def total_articles(self) -> int:
+        return self.published_count + self.moderated_count + self.rejected_count
@@ -0,0 +1,159 @@
+"""
+Кеш целых страниц для анонимных читателей с инвалидацией по тегам.
+
+Представление помечает страницу тегами того, что на ней показано
+("feed", "article:<id>", "category:<id>", "author:<id>"...), вместе со страницей
+сохраняются версии этих тегов. Сигналы увеличивают версии тегов при изменении
+данных, и при следующем запросе устаревшая страница отрисовывается заново.
+Версии тегов, известных по URL ("feed", "article:<id>"), читаются до загрузки
+данных: если запись сбросила их во время отрисовки, страница не сохраняется.
+Время жизни записи ограничено, в том числе из-за относительных дат на страницах.
+
+Страница из кеша отдается без отрисовки и без запросов представления, но
+валидатор условных запросов (articles.conditional) вычисляется раньше, поэтому
+каждое попадание в кеш стоит одного индексированного запроса к базе данных.
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+from .cache import KEY_PREFIX, bump_version, get_versions
+
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Тег, которым помечаются все страницы (шапка, меню категорий)
+LAYOUT_TAG = "layout"
+
+_TAGS_ATTRIBUTE = "_page_cache_tags"
+
+# Cookie хранилища сообщений django.contrib.messages (CookieStorage)
+MESSAGES_COOKIE_NAME = "messages"
+
+
+def _tag_namespace(tag: str) -> str:
+    return f"page:{tag}"
+
+
+def add_cache_tags(request: HttpRequest, *tags: str) -> None:
+    """
+    Пометить страницу, которую отрисовывает представление, тегами
+
+    Args:
+        request: Текущий запрос
+        tags: Теги, например "article:1"
+    """
+    if hasattr(request, _TAGS_ATTRIBUTE):
+        getattr(request, _TAGS_ATTRIBUTE).update(tags)
+
+
+def invalidate_tags(*tags: str, replicated: bool = False) -> None:
+    """
+    Сбросить все закешированные страницы, помеченные хотя бы одним из тегов
+
+    Args:
+        tags: Теги страниц
+        replicated: Повторить сброс после окна репликации (см. bump_version)
+    """
+    if tags:
+        bump_version(*(_tag_namespace(tag) for tag in tags), replicated=replicated)
+
+
+def article_tags(articles) -> List[str]:
+    """
+    Теги карточек статей: сама статья и ее автор
+
+    Args:
+        articles: Статьи, показанные на странице
+
+    Returns:
+        Список тегов
+    """
+    tags = []
+    for article in articles:
+        tags.append(f"article:{article.pk}")
+        tags.append(f"author:{article.author_id}")
+    return tags
+
+
+def get_tag_versions(tags: Iterable[str]) -> Dict[str, int]:
+    """
+    Получить текущие версии тегов одним запросом к кешу
+    """
+    tags = list(tags)
+    versions = get_versions(*(_tag_namespace(tag) for tag in tags))
+    return {tag: versions[_tag_namespace(tag)] for tag in tags}
+
+
+def is_cacheable_request(request: HttpRequest) -> bool:
+    """
+    Страницу можно отдать из кеша только анонимному GET-запросу без сессии
+    и без отложенных сообщений
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and MESSAGES_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def _page_key(request: HttpRequest) -> str:
+    raw = f"{request.get_host()}:{request.get_full_path()}"
+    return f"{KEY_PREFIX}:page:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+
+def start(request: HttpRequest, tags: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    Начать сбор тегов страницы
+
+    Args:
+        request: Запрос
+        tags: Теги, известные до загрузки данных (например, из URL)
+
+    Returns:
+        Версии начальных тегов, прочитанные до отрисовки
+    """
+    tags = {LAYOUT_TAG, *tags}
+    setattr(request, _TAGS_ATTRIBUTE, set(tags))
+    return get_tag_versions(tags)
+
+
+def get(request: HttpRequest) -> Optional[HttpResponse]:
+    """
+    Получить страницу из кеша, если версии всех ее тегов не изменились
+
+    Returns:
+        Закешированный ответ или None
+    """
+    entry = cache.get(_page_key(request))
+    if entry is None:
+        return None
+
+    versions, response = entry
+    if get_tag_versions(versions) != versions:
+        return None
+    return response
+
+
+def store(request: HttpRequest, response: HttpResponse, versions: Dict[str, int]):
+    """
+    Сохранить страницу вместе с версиями ее тегов
+
+    Args:
+        request: Запрос
+        response: Отрисованный ответ представления
+        versions: Версии тегов, прочитанные до отрисовки страницы
+    """
+    if response.status_code != 200 or response.cookies or response.streaming:
+        return
+
+    current = get_tag_versions(getattr(request, _TAGS_ATTRIBUTE) | versions.keys())
+    # Данные изменились во время отрисовки: страница могла получить старые
+    # данные, и под новыми версиями она отдавалась бы до истечения срока
+    if any(current[tag] != version for tag, version in versions.items()):
+        return
+    # Для тегов, добавленных во время отрисовки, версии читаются сейчас
+    cache.set(_page_key(request), (current, response), PAGE_CACHE_TIMEOUT)
@@ -0,0 +1,338 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from .cache import make_key
+
+# Поддерживаемые сортировки для курсорной пагинации и их направление
+CURSOR_ORDERINGS = {
+    "-created_at": True,
+    "created_at": False,
+}
+
+# Стратегии подсчета общего количества записей:
+# "exact" - COUNT(*) на каждый запрос,
+# "cached" - точное значение из кеша с инвалидацией при записи,
+# "estimated" - оценка планировщика PostgreSQL для больших выборок (иначе как "cached")
+COUNT_STRATEGIES = ("exact", "cached", "estimated")
+COUNT_CACHE_TIMEOUT = 60 * 5
+# Ниже этого порога оценка планировщика не используется, считаем точно
+ESTIMATED_COUNT_THRESHOLD = 10_000
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """
+    Оценить количество записей по статистике планировщика PostgreSQL
+
+    Args:
+        queryset: Набор записей
+
+    Returns:
+        Оценка количества или None, если оценка недоступна (не PostgreSQL)
+        или выборка меньше ESTIMATED_COUNT_THRESHOLD
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    rows = int(plan[0]["Plan"]["Plan Rows"])
+    return rows if rows >= ESTIMATED_COUNT_THRESHOLD else None
+
+
+def get_count(queryset: QuerySet, strategy: str = "exact") -> int:
+    """
+    Получить количество записей выбранной стратегией. Кешированные значения
+    привязаны к версии модели и сбрасываются сигналами при записи.
+
+    Args:
+        queryset: Набор записей
+        strategy: Стратегия подсчета из COUNT_STRATEGIES
+
+    Returns:
+        Количество записей (точное или оценочное)
+    """
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия подсчета {strategy!r}")
+
+    if strategy == "exact":
+        return queryset.count()
+
+    try:
+        sql = str(queryset.order_by().query)
+    except EmptyResultSet:
+        return 0
+
+    key = make_key(
+        f"count:{queryset.model._meta.label_lower}",
+        strategy,
+        hashlib.md5(sql.encode("utf-8")).hexdigest(),
+    )
+    count = cache.get(key)
+
+    if count is None:
+        if strategy == "estimated":
+            count = estimate_count(queryset)
+        if count is None:
+            count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+
+    return count
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator, который считает общее количество записей выбранной стратегией
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        count_strategy: str = "exact",
+        count: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+
+        # Заранее известное количество (например, денормализованный счетчик)
+        if count is not None:
+            self.__dict__["count"] = count
+
+    @cached_property
+    def count(self) -> int:
+        if isinstance(self.object_list, QuerySet):
+            return get_count(self.object_list, self.count_strategy)
+        return super().count
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    """
+    Закодировать позицию (created_at, id) в непрозрачный токен
+
+    Args:
+        created_at: Дата создания записи
+        pk: ID записи
+
+    Returns:
+        Строка токена, безопасная для URL
+    """
+    raw = json.dumps([created_at.isoformat(), pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Раскодировать токен курсора
+
+    Args:
+        token: Строка токена
+
+    Returns:
+        Кортеж (created_at, id) или None, если токен пустой или некорректный
+    """
+    if not token:
+        return None
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        return None
+
+
+class CursorPage:
+    """
+    Страница курсорной пагинации. Повторяет интерфейс Page,
+    который используется в шаблонах, но без номеров страниц.
+    """
+
+    is_cursor = True
+
+    def __init__(
+        self,
+        object_list: List[Any],
+        next_cursor: Optional[str] = None,
+        previous_cursor: Optional[str] = None,
+    ):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return f"<CursorPage next={self.next_cursor} previous={self.previous_cursor}>"
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+def paginate_by_cursor(
+    queryset: QuerySet,
+    per_page: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    order_by: str = "-created_at",
+) -> CursorPage:
+    """
+    Получить страницу по курсору. Позиция задается парой (created_at, id),
+    поэтому стоимость запроса не зависит от глубины страницы.
+
+    Args:
+        queryset: Исходный набор записей с полями created_at и id
+        per_page: Количество записей на страницу
+        after: Токен записи, после которой начинается страница
+        before: Токен записи, перед которой заканчивается страница
+        order_by: Сортировка ("-created_at" или "created_at")
+
+    Returns:
+        Объект CursorPage
+    """
+    if order_by not in CURSOR_ORDERINGS:
+        raise ValueError(f"Курсорная пагинация не поддерживает сортировку {order_by!r}")
+
+    source = queryset
+    descending = CURSOR_ORDERINGS[order_by]
+    after_position = decode_cursor(after)
+    before_position = decode_cursor(before) if after_position is None else None
+
+    # При переходе назад выбираем записи в обратном порядке и затем разворачиваем
+    backwards = before_position is not None
+    position = before_position if backwards else after_position
+    forward = descending != backwards
+    lookup = "lt" if forward else "gt"
+
+    if forward:
+        queryset = queryset.order_by("-created_at", "-id")
+    else:
+        queryset = queryset.order_by("created_at", "id")
+
+    if position is not None:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(**{f"created_at__{lookup}": created_at})
+            | Q(created_at=created_at, **{f"id__{lookup}": pk})
+        )
+
+    items = list(queryset[: per_page + 1])
+    has_more = len(items) > per_page
+    items = items[:per_page]
+
+    if backwards and len(items) < per_page:
+        # Перед курсором меньше записей, чем на страницу: это начало списка,
+        # и вместо неполной страницы отдается первая страница целиком
+        return paginate_by_cursor(source, per_page, order_by=order_by)
+
+    if backwards:
+        items.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, position is not None
+
+    if not items:
+        return CursorPage([])
+
+    return CursorPage(
+        items,
+        next_cursor=(
+            encode_cursor(items[-1].created_at, items[-1].pk) if has_next else None
+        ),
+        previous_cursor=(
+            encode_cursor(items[0].created_at, items[0].pk) if has_previous else None
+        ),
+    )
+
+
+def listing_page_params(query) -> Dict[str, Any]:
+    """
+    Параметры страницы ленты из GET-параметров запроса. Лента листается
+    по курсору, а старые ссылки ?page=N открываются по номеру страницы.
+
+    Args:
+        query: GET-параметры запроса
+
+    Returns:
+        Аргументы пагинации для методов ArticleDAO
+    """
+    after, before = query.get("after"), query.get("before")
+    if not after and not before:
+        try:
+            page = int(query.get("page", 1))
+        except ValueError:
+            page = 1
+        if page > 1:
+            return {"page": page, "count_strategy": "estimated"}
+    return {"cursor": True, "after": after, "before": before}
+
+
+def paginate_queryset(
+    queryset: QuerySet,
+    page: int = 1,
+    per_page: int = 10,
+    cursor: bool = False,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    order_by: str = "-created_at",
+    count_strategy: str = "exact",
+    count: Optional[int] = None,
+) -> Tuple[Any, Optional[int]]:
+    """
+    Разбить набор записей на страницы по номеру страницы или по курсору
+
+    Args:
+        queryset: Отсортированный набор записей
+        page: Номер страницы (для обычной пагинации)
+        per_page: Количество записей на страницу
+        cursor: Использовать курсорную пагинацию (для сортировок не из
+            CURSOR_ORDERINGS используется пагинация по номеру страницы)
+        after: Токен курсора "после" (для курсорной пагинации)
+        before: Токен курсора "до" (для курсорной пагинации)
+        order_by: Сортировка набора записей
+        count_strategy: Стратегия подсчета общего количества (см. COUNT_STRATEGIES)
+        count: Заранее известное общее количество (подсчет тогда не выполняется)
+
+    Returns:
+        Кортеж (страница, общее количество записей). При курсорной пагинации
+        общее количество не считается и равно None
+    """
+    if cursor and order_by in CURSOR_ORDERINGS:
+        page_obj = paginate_by_cursor(
+            queryset, per_page, after=after, before=before, order_by=order_by
+        )
+        return page_obj, None
+
+    paginator = CountingPaginator(
+        queryset, per_page, count_strategy=count_strategy, count=count
+    )
+    page_obj = paginator.get_page(page)
+    return page_obj, paginator.count
@@ -0,0 +1,134 @@
+import hashlib
+import json
+
+import markdown
+from django.conf import settings
+from django.utils.text import Truncator
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+
+# Количество верхнеуровневых блоков Markdown, попадающих в превью статьи
+EXCERPT_BLOCKS = 3
+# Максимальная длина превью в символах видимого текста
+EXCERPT_MAX_CHARS = 600
+
+
+class _ExcerptTreeprocessor(Treeprocessor):
+    """
+    Оставляет в дереве документа только первые блоки
+    """
+
+    def __init__(self, md, blocks: int):
+        super().__init__(md)
+        self.blocks = blocks
+
+    def run(self, root):
+        for child in list(root)[self.blocks :]:
+            root.remove(child)
+
+
+class ExcerptExtension(Extension):
+    """
+    Расширение Markdown для построения превью из первых блоков документа
+    """
+
+    def __init__(self, blocks: int = EXCERPT_BLOCKS, **kwargs):
+        self.blocks = blocks
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md):
+        md.treeprocessors.register(_ExcerptTreeprocessor(md, self.blocks), "excerpt", 5)
+
+
+def get_markdown_config() -> dict:
+    """
+    Получить текущую конфигурацию Markdown (расширения и их настройки)
+    """
+    return {
+        "extensions": list(getattr(settings, "MARKDOWN_EXTENSIONS", [])),
+        "extension_configs": dict(getattr(settings, "MARKDOWN_EXTENSION_CONFIGS", {})),
+    }
+
+
+def get_content_hash(content: str) -> str:
+    """
+    Получить хеш содержимого статьи с учетом конфигурации Markdown.
+    При смене расширений или их настроек хеш меняется, и HTML считается устаревшим.
+
+    Args:
+        content: Markdown-текст статьи
+
+    Returns:
+        Шестнадцатеричный SHA-256 хеш
+    """
+    config = json.dumps(
+        [get_markdown_config(), EXCERPT_BLOCKS, EXCERPT_MAX_CHARS],
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(config.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((content or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def render_markdown(content: str) -> str:
+    """
+    Преобразовать Markdown-текст в HTML с текущей конфигурацией
+
+    Args:
+        content: Markdown-текст
+
+    Returns:
+        HTML-строка (пустая строка для пустого текста)
+    """
+    if not content:
+        return ""
+
+    return markdown.markdown(content, **get_markdown_config())
+
+
+def render_excerpt(content: str) -> str:
+    """
+    Построить HTML-превью статьи: первые EXCERPT_BLOCKS блоков,
+    обрезанные до EXCERPT_MAX_CHARS символов с сохранением корректной разметки
+
+    Args:
+        content: Markdown-текст
+
+    Returns:
+        HTML-строка превью (пустая строка для пустого текста)
+    """
+    if not content:
+        return ""
+
+    config = get_markdown_config()
+    html = markdown.markdown(
+        content,
+        extensions=[*config["extensions"], ExcerptExtension()],
+        extension_configs=config["extension_configs"],
+    )
+    return Truncator(html).chars(EXCERPT_MAX_CHARS, html=True)
+
+
+def render_article(article, force: bool = False) -> bool:
+    """
+    Обновить сохраненный HTML и превью статьи, если они не соответствуют содержимому.
+    Сама статья не сохраняется, это остается на вызывающем коде.
+
+    Args:
+        article: Объект статьи
+        force: Перерисовать HTML даже при совпадении хеша
+
+    Returns:
+        True, если HTML и превью были перерисованы
+    """
+    content_hash = get_content_hash(article.content)
+
+    if not force and article.content_hash == content_hash:
+        return False
+
+    article.content_html = render_markdown(article.content)
+    article.excerpt_html = render_excerpt(article.content)
+    article.content_hash = content_hash
+    return True
@@ -0,0 +1,277 @@
+"""
+Полнотекстовый поиск по статьям.
+
+Бэкенд выбирается по типу базы данных:
+- PostgreSQL: сгенерированная колонка search_vector (tsvector, конфигурация
+  "russian") с GIN-индексом, синхронизируется самой базой данных;
+- SQLite: виртуальная таблица FTS5 articles_article_fts, синхронизируется
+  сигналами при сохранении и удалении статей;
+- остальные базы: поиск подстроки без ранжирования.
+
+В индекс SQLite попадают только опубликованные статьи.
+"""
+
+import hashlib
+import json
+import re
+from typing import Iterable, List, Optional
+
+from django.core.cache import cache
+from django.db import connections, router
+from django.db.models import BooleanField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+from .cache import make_key
+from .models import Article
+
+SEARCH_CONFIG = "russian"
+FTS_TABLE = "articles_article_fts"
+
+# Вес заголовка относительно текста статьи при ранжировании в FTS5
+FTS_TITLE_WEIGHT = 10.0
+FTS_CONTENT_WEIGHT = 1.0
+
+# Кеш списков ID найденных статей по нормализованному запросу
+SEARCH_NAMESPACE = "search"
+SEARCH_CACHE_TIMEOUT = 60 * 5
+SEARCH_CACHE_MAX_RESULTS = 1000
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class SearchBackend:
+    """
+    Поиск подстроки в заголовке и тексте статьи (без индекса и ранжирования)
+    """
+
+    def normalize(self, query: str) -> str:
+        """
+        Привести запрос к каноническому виду для ключа кеша: запросы,
+        которые находят одни и те же статьи, должны давать одну строку
+
+        Args:
+            query: Поисковый запрос
+
+        Returns:
+            Нормализованный запрос
+        """
+        return " ".join(query.casefold().split())
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        """
+        Оставить в наборе только статьи, подходящие под запрос
+
+        Args:
+            queryset: Набор статей
+            query: Поисковый запрос
+
+        Returns:
+            Отфильтрованный набор статей
+        """
+        return queryset.filter(Q(title__icontains=query) | Q(content__icontains=query))
+
+    def rank(self, query: str):
+        """
+        Выражение релевантности статьи запросу (чем больше, тем релевантнее)
+
+        Args:
+            query: Поисковый запрос
+
+        Returns:
+            Выражение для annotate()
+        """
+        return Value(0.0, output_field=FloatField())
+
+    def index(self, article: Article) -> None:
+        """
+        Обновить статью в индексе после сохранения
+        """
+
+    def remove(self, article_ids: Iterable[int]) -> None:
+        """
+        Удалить статьи из индекса
+        """
+
+    def rebuild(self) -> int:
+        """
+        Полностью перестроить индекс
+
+        Returns:
+            Количество проиндексированных статей
+        """
+        return 0
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Поиск по колонке search_vector с GIN-индексом
+    """
+
+    def __init__(self, using: str):
+        self.using = using
+
+    def normalize(self, query: str) -> str:
+        # Без обращения к базе данных: слова без фраз в кавычках и операторов
+        # websearch_to_tsquery ("or", "-слово") ищутся через AND, порядок не важен
+        words = query.casefold().split()
+        if '"' in query or "or" in words or any(w.startswith("-") for w in words):
+            return " ".join(words)
+        return " ".join(sorted(set(words)))
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        return queryset.filter(
+            RawSQL(
+                f'"articles_article"."search_vector" @@ '
+                f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)",
+                (query,),
+                output_field=BooleanField(),
+            )
+        )
+
+    def rank(self, query: str):
+        return RawSQL(
+            f'ts_rank("articles_article"."search_vector", '
+            f"websearch_to_tsquery('{SEARCH_CONFIG}', %s))",
+            (query,),
+            output_field=FloatField(),
+        )
+
+    def rebuild(self) -> int:
+        # Колонка сгенерированная, база данных пересчитывает ее сама
+        return Article.objects.count()
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Поиск по виртуальной таблице FTS5. Стемминга для русского языка в FTS5 нет,
+    поэтому каждое слово запроса ищется как префикс.
+    """
+
+    def __init__(self, using: str):
+        self.using = using
+
+    def normalize(self, query: str) -> str:
+        # Слова ищутся через AND, поэтому порядок и повторы не важны
+        return " ".join(sorted(set(_WORD_RE.findall(query.lower()))))
+
+    @staticmethod
+    def build_match(query: str) -> Optional[str]:
+        """
+        Преобразовать запрос пользователя в выражение MATCH для FTS5
+
+        Args:
+            query: Поисковый запрос
+
+        Returns:
+            Выражение MATCH или None, если в запросе нет слов
+        """
+        words = _WORD_RE.findall(query.lower())
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        match = self.build_match(query)
+        if match is None:
+            return queryset.none()
+
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)
+            )
+        )
+
+    def rank(self, query: str):
+        match = self.build_match(query)
+        if match is None:
+            return super().rank(query)
+
+        # bm25() возвращает меньшие значения для более релевантных строк
+        return RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}, {FTS_TITLE_WEIGHT}, {FTS_CONTENT_WEIGHT}) "
+            f"FROM {FTS_TABLE} "
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "articles_article"."id")',
+            (match,),
+            output_field=FloatField(),
+        )
+
+    def index(self, article: Article) -> None:
+        self.remove([article.pk])
+        if article.status != "published":
+            return
+
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, content) VALUES (%s, %s, %s)",
+                (article.pk, article.title, article.content),
+            )
+
+    def remove(self, article_ids: Iterable[int]) -> None:
+        article_ids = list(article_ids)
+        if not article_ids:
+            return
+
+        placeholders = ", ".join(["%s"] * len(article_ids))
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", article_ids
+            )
+
+    def rebuild(self) -> int:
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, content) "
+                f"SELECT id, title, content FROM articles_article "
+                f"WHERE status = 'published'"
+            )
+            indexed = cursor.rowcount
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        return indexed
+
+
+def get_search_backend(using: Optional[str] = None) -> SearchBackend:
+    """
+    Получить бэкенд поиска для базы данных статей
+
+    Args:
+        using: Алиас базы данных (по умолчанию - база для записи статей)
+
+    Returns:
+        Объект бэкенда поиска
+    """
+    using = using or router.db_for_write(Article)
+    vendor = connections[using].vendor
+
+    if vendor == "postgresql":
+        return PostgresSearchBackend(using)
+    if vendor == "sqlite":
+        return SQLiteSearchBackend(using)
+    return SearchBackend()
+
+
+def get_cached_ids(
+    backend: SearchBackend, query: str, queryset: QuerySet, *key_parts
+) -> List[int]:
+    """
+    Получить ID найденных статей из кеша по нормализованному запросу.
+    Кеш сбрасывается сигналами при изменении статей и истекает по TTL.
+
+    Args:
+        backend: Бэкенд поиска, нормализующий запрос
+        query: Поисковый запрос
+        queryset: Отфильтрованный и отсортированный набор статей для вычисления
+        key_parts: Остальные параметры, влияющие на результат (категория, сортировка)
+
+    Returns:
+        Список ID (не более SEARCH_CACHE_MAX_RESULTS)
+    """
+    raw_key = json.dumps([backend.normalize(query), *key_parts], ensure_ascii=False)
+    key = make_key(SEARCH_NAMESPACE, hashlib.md5(raw_key.encode("utf-8")).hexdigest())
+
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(queryset.values_list("id", flat=True)[:SEARCH_CACHE_MAX_RESULTS])
+        cache.set(key, ids, SEARCH_CACHE_TIMEOUT)
+
+    return ids
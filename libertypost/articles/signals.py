@@ -0,0 +1,234 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.images import ARTICLE_IMAGE_VARIANTS, schedule_variants
+
+from .cache import bump_version
+from .models import Article, AuthorStats, Category, Comment, User
+from .page_cache import LAYOUT_TAG, invalidate_tags
+from .autocomplete import AUTOCOMPLETE_NAMESPACE, AUTOCOMPLETE_RESET_NAMESPACE
+from .search import SEARCH_NAMESPACE, get_search_backend
+
+
+def _bump_on_commit(*namespaces: str) -> None:
+    # Версии увеличиваются после фиксации транзакции, иначе параллельный запрос
+    # успеет закешировать старые данные под новой версией, и еще раз после окна
+    # репликации - для запросов, прочитавших старые данные с реплики
+    transaction.on_commit(partial(bump_version, *namespaces, replicated=True))
+
+
+def _invalidate_on_commit(*tags: str) -> None:
+    transaction.on_commit(partial(invalidate_tags, *tags, replicated=True))
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(m2m_changed, sender=Article.categories.through)
+def invalidate_article_counts(sender, **kwargs):
+    """
+    Сбросить кешированные количества статей при любом изменении статей
+    """
+    if kwargs.get("action", "post").startswith("pre"):
+        return
+
+    _bump_on_commit("count:articles.article")
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_counts(sender, **kwargs):
+    """
+    Сбросить кешированные количества комментариев при изменении комментариев
+    """
+    _bump_on_commit("count:articles.comment")
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Article)
+@receiver(m2m_changed, sender=Article.categories.through)
+def invalidate_categories(sender, **kwargs):
+    """
+    Сбросить кеш категорий контекстных процессоров при изменении категорий
+    или связей статей с категориями
+    """
+    if kwargs.get("action", "post").startswith("pre"):
+        return
+
+    _bump_on_commit("categories")
+
+
+@receiver(post_save, sender=Article)
+def update_search_index(sender, instance, using, **kwargs):
+    """
+    Обновить статью в полнотекстовом индексе после создания или изменения
+    (включая смену статуса, например архивацию)
+    """
+    get_search_backend(using).index(instance)
+    _bump_on_commit(SEARCH_NAMESPACE, AUTOCOMPLETE_NAMESPACE)
+
+
+@receiver(post_delete, sender=Article)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    """
+    Удалить статью из полнотекстового индекса
+    """
+    get_search_backend(using).remove([instance.pk])
+    _bump_on_commit(SEARCH_NAMESPACE, AUTOCOMPLETE_RESET_NAMESPACE)
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+def invalidate_search_results(sender, **kwargs):
+    """
+    Сбросить кеш результатов поиска при изменении категорий статей
+    (результаты фильтруются по категории)
+    """
+    if kwargs.get("action", "post").startswith("pre"):
+        return
+
+    _bump_on_commit(SEARCH_NAMESPACE)
+
+
+def _article_page_tags(article):
+    # author-stats: количество статей автора на странице статьи
+    return ["feed", f"article:{article.pk}", f"author-stats:{article.author_id}"]
+
+
+@receiver(post_save, sender=Article)
+def invalidate_article_pages(sender, instance, **kwargs):
+    """
+    Сбросить закешированные страницы, на которых показана статья:
+    ленту, саму статью, статистику автора и страницы ее категорий
+    """
+    category_ids = instance.categories.values_list("id", flat=True)
+    _invalidate_on_commit(
+        *_article_page_tags(instance),
+        *(f"category:{category_id}" for category_id in category_ids),
+    )
+
+
+@receiver(pre_delete, sender=Article)
+def remember_deleted_article_categories(sender, instance, **kwargs):
+    # После удаления связи с категориями уже недоступны
+    instance._deleted_category_ids = list(
+        instance.categories.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Article)
+def invalidate_deleted_article_pages(sender, instance, **kwargs):
+    """
+    Сбросить закешированные страницы удаленной статьи
+    """
+    _invalidate_on_commit(
+        *_article_page_tags(instance),
+        *(
+            f"category:{category_id}"
+            for category_id in getattr(instance, "_deleted_category_ids", [])
+        ),
+    )
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+def invalidate_category_pages(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Сбросить страницы категорий и статей при изменении связей между ними.
+    У статей обновляется updated_at, так как от него зависят валидаторы
+    условных запросов и ключи кеша карточек.
+    """
+    if action == "pre_clear":
+        related = instance.articles if reverse else instance.categories
+        instance._cleared_ids = set(related.values_list("id", flat=True))
+        return
+    if action.startswith("pre"):
+        return
+
+    if action == "post_clear":
+        pk_set = getattr(instance, "_cleared_ids", set())
+
+    if reverse:
+        category_ids, article_ids = {instance.pk}, pk_set
+    else:
+        category_ids, article_ids = pk_set, {instance.pk}
+
+    _invalidate_on_commit(
+        "feed",
+        *(f"category:{category_id}" for category_id in category_ids),
+        *(f"article:{article_id}" for article_id in article_ids),
+    )
+    Article.objects.filter(pk__in=article_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """
+    Сбросить страницу статьи и карточки с ее счетчиком комментариев
+    """
+    _invalidate_on_commit(f"article:{instance.article_id}")
+
+
+@receiver(post_delete, sender=Comment)
+def touch_commented_article(sender, instance, origin=None, **kwargs):
+    """
+    Обновить updated_at статьи при удалении комментария: время последнего
+    комментария уменьшается, а Last-Modified страницы статьи не должен
+    идти назад
+    """
+    # Комментарии удаляемой статьи удаляются вместе с ней
+    if isinstance(origin, Article) or getattr(origin, "model", None) is Article:
+        return
+    Article.objects.filter(pk=instance.article_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_layout_pages(sender, instance, **kwargs):
+    """
+    Сбросить все страницы при изменении категорий (меню в шапке)
+    """
+    _invalidate_on_commit(LAYOUT_TAG, f"category:{instance.pk}")
+
+
+@receiver(post_save, sender=Category)
+def touch_category_articles(sender, instance, created, **kwargs):
+    """
+    Обновить updated_at статей переименованной категории, чтобы сбросить
+    закешированные карточки с ее названием
+    """
+    if not created:
+        Article.objects.filter(categories=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Article)
+def build_article_image_variants(sender, instance, raw=False, **kwargs):
+    """
+    Построить уменьшенные копии нового изображения статьи в фоне
+    """
+    if not raw:
+        schedule_variants(instance, "image", ARTICLE_IMAGE_VARIANTS)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(sender, instance, **kwargs):
+    """
+    Сбросить страницы с карточками и комментариями пользователя
+    (имя и аватарка)
+    """
+    _invalidate_on_commit(f"author:{instance.pk}")
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, raw=False, **kwargs):
+    """
+    Создать пустую статистику нового пользователя, чтобы первая статья или
+    комментарий обновляли счетчики, а не пересчитывали статистику целиком
+    """
+    if created and not raw:
+        AuthorStats.objects.bulk_create(
+            [AuthorStats(author=instance)], ignore_conflicts=True
+        )
@@ -0,0 +1,68 @@
+"""
+Допустимые режимы сортировки статей.
+
+Каждый режим соответствует сортировке, для которой есть индекс
+(см. Meta.indexes модели Article), поэтому сортировать по произвольным
+колонкам через параметры запроса нельзя.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+# Режим -> сортировка (последнее поле - id, чтобы порядок был однозначным)
+SORT_MODES = {
+    "newest": ("-created_at", "-id"),
+    "oldest": ("created_at", "id"),
+    "commented": ("-comment_count", "-id"),
+    # Только для поиска: search_rank добавляет бэкенд поиска
+    "relevance": ("-search_rank", "-created_at", "-id"),
+}
+
+# Старые значения параметра сортировки (поля модели)
+SORT_ALIASES = {
+    "-created_at": "newest",
+    "created_at": "oldest",
+    "-comment_count": "commented",
+}
+
+DEFAULT_SORT = "newest"
+LIST_SORT_MODES = ("newest", "oldest", "commented")
+SEARCH_SORT_MODES = LIST_SORT_MODES + ("relevance",)
+
+
+def resolve_sort(value: Optional[str], allowed: Iterable[str] = LIST_SORT_MODES) -> str:
+    """
+    Привести значение параметра сортировки к режиму сортировки
+
+    Args:
+        value: Режим или старое значение (поле модели), пустое значение - по умолчанию
+        allowed: Допустимые режимы
+
+    Returns:
+        Название режима из SORT_MODES
+
+    Raises:
+        ValueError: Если режим неизвестен или недопустим
+    """
+    if not value:
+        return DEFAULT_SORT
+
+    mode = SORT_ALIASES.get(value, value)
+    if mode not in allowed:
+        raise ValueError(f"Неизвестная сортировка {value!r}")
+    return mode
+
+
+def get_ordering(
+    value: Optional[str], allowed: Iterable[str] = LIST_SORT_MODES
+) -> Tuple[str, ...]:
+    """
+    Получить поля для order_by() по режиму сортировки
+
+    Args:
+        value: Режим или старое значение (см. resolve_sort)
+        allowed: Допустимые режимы
+
+    Returns:
+        Кортеж полей сортировки
+    """
+    return SORT_MODES[resolve_sort(value, allowed)]
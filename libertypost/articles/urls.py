@@ -12,4 +12,5 @@ urlpatterns = [
     path("archive/<int:article_id>/", views.delete_article, name="delete_article"),
     path("category/<slug:category_slug>/", views.category, name="category"),
     path("search/", views.search, name="search"),
+    path("suggest/", views.suggest, name="suggest"),
 ]
@@ -1,26 +1,41 @@
-import markdown
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
-from django.http import HttpRequest, HttpResponse
+from django.core.exceptions import BadRequest
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
-
-from .dao import ArticleDAO, CategoryDAO, CommentDAO, UserDAO
-
-
-def articles(request: HttpRequest) -> HttpResponse:
-    page = request.GET.get("page", 1)
-
-    try:
-        page = int(page)
-    except ValueError:
-        page = 1
-
-    articles_data = ArticleDAO.get_articles_with_comment_count(page=page)
-
-    for article in articles_data["articles"]:
-        if hasattr(article, "content") and article.content:
-            article.html_content = markdown.markdown(article.content)
-        else:
-            article.html_content = None
+from django.views.decorators.cache import cache_control
+
+from . import conditional
+from .autocomplete import autocomplete
+from .dao import ArticleDAO, CategoryDAO, CommentDAO
+from .decorators import (
+    anonymous_page_cache,
+    condition,
+    query_budget,
+    validated_image_uploads,
+)
+from .page_cache import add_cache_tags, article_tags
+from .pagination import listing_page_params
+from .sorting import SEARCH_SORT_MODES, resolve_sort
+
+
+async def _arender(
+    request: HttpRequest, template_name: str, context: dict
+) -> HttpResponse:
+    # Контекстные процессоры и шаблоны обращаются к request.user и к базе данных,
+    # поэтому отрисовка выполняется в потоке
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@condition(etag_func=conditional.feed_etag)
+@anonymous_page_cache(tags=lambda request: ["feed"])
+@query_budget(6)
+async def articles(request: HttpRequest) -> HttpResponse:
+    # Лента листается по курсору, чтобы глубокие страницы не замедлялись
+    articles_data = await ArticleDAO.aget_articles_with_comment_count(
+        **listing_page_params(request.GET)
+    )
+    add_cache_tags(request, "feed", *article_tags(articles_data["articles"]))
 
     data = {
         "articles": articles_data["articles"],
@@ -29,26 +44,44 @@ def articles(request: HttpRequest) -> HttpResponse:
         "total_articles": articles_data["total_articles"],
     }
 
-    return render(request, "articles/articles.html", data)
+    return await _arender(request, "articles/articles.html", data)
 
 
-def article(request: HttpRequest, article_id: int) -> HttpResponse:
-    if request.method == "POST" and request.user.is_authenticated:
+@condition(
+    etag_func=conditional.article_etag,
+    last_modified_func=conditional.article_last_modified,
+)
+@anonymous_page_cache(tags=lambda request, article_id: [f"article:{article_id}"])
+@query_budget(7)
+async def article(request: HttpRequest, article_id: int) -> HttpResponse:
+    # request.user загружается из базы данных синхронно, в цикле событий - auser()
+    user = await request.auser() if request.method == "POST" else None
+    if user is not None and user.is_authenticated:
         comment_text = request.POST.get("comment", "").strip()
         if comment_text:
-            CommentDAO.create_comment(
-                article_id=article_id, author_id=request.user.id, content=comment_text
+            await sync_to_async(CommentDAO.create_comment)(
+                article_id=article_id, author_id=user.id, content=comment_text
             )
         return redirect("articles:article", article_id=article_id)
 
-    article = ArticleDAO.get_article_by_id(
-        article_id=article_id, prefetch_comments=True, prefetch_categories=True
+    detail = await ArticleDAO.aget_article_detail(
+        article_id=article_id, comments_page=request.GET.get("page", 1)
+    )
+    article = detail["article"]
+    add_cache_tags(
+        request,
+        f"article:{article.id}",
+        f"author:{article.author_id}",
+        f"author-stats:{article.author_id}",
+        *(f"author:{comment.author_id}" for comment in detail["comments"]),
     )
-    author = UserDAO.get_author_stats(author_id=article.author.id)
-    comments = CommentDAO.get_comments_for_article(article_id=article.id)
 
-    content = article.content
-    content = markdown.markdown(content) if content else None
+    return await sync_to_async(_render_article)(request, detail)
+
+
+def _render_article(request: HttpRequest, detail) -> HttpResponse:
+    article = detail["article"]
+    content = article.content_html or None
 
     is_owner = False
     if request.user.is_authenticated:
@@ -61,34 +94,49 @@ def article(request: HttpRequest, article_id: int) -> HttpResponse:
             "content": content,
             "author_name": article.author.username,
             "author_id": article.author.id,
-            "author_avatar": article.author.image.url if article.author.image else None,
+            "author_avatar": article.author.image,
+            "author_avatar_variants": article.author.image_variants,
             "categories": [cat.name for cat in article.categories.all()],
-            "image": article.image.url if article.image else None,
+            "image": article.image,
+            "image_variants": article.image_variants,
             "published_ago": article.created_at,
             "comment_count": article.comment_count,
             "source": article.source,
-            "total_articles": author["total_articles"],
-            "comments": comments["comments"],
+            "total_articles": detail["author_total_articles"],
+            "comments": detail["comments"],
             "url": article.get_absolute_url(),
         },
-        "page_obj": comments["page_obj"],
-        "is_paginated": comments["is_paginated"],
-        "total_comments": comments["total_comments"],
+        "page_obj": detail["page_obj"],
+        "is_paginated": detail["is_paginated"],
+        "total_comments": detail["total_comments"],
         "is_owner": is_owner,
     }
     return render(request, "articles/article.html", context=data)
 
 
 @login_required
+@validated_image_uploads
 def create_article(request: HttpRequest) -> HttpResponse:
+    context = {}
+
     if request.method == "POST":
         title = request.POST.get("title", "").strip()
         content = request.POST.get("content", "").strip()
         source = request.POST.get("link", "").strip()
         category_ids = request.POST.getlist("cats")
         image = request.FILES.get("file")
-
-        if all([title, content, source, category_ids]):
+        upload_error = request.upload_errors.get("file")
+
+        if upload_error:
+            # Введенный текст не теряется, если изображение отклонено
+            context = {
+                "upload_error": upload_error,
+                "title": title,
+                "content": content,
+                "source": source,
+                "selected_category_ids": [int(c) for c in category_ids if c.isdigit()],
+            }
+        elif all([title, content, source, category_ids]):
             ArticleDAO.create_article(
                 author_id=request.user.id,
                 title=title,
@@ -99,24 +147,30 @@ def create_article(request: HttpRequest) -> HttpResponse:
             )
             return redirect("home")
 
-    return render(request, "articles/create_article.html")
+    return render(request, "articles/create_article.html", context=context)
 
 
 @login_required
+@validated_image_uploads
 def update_article(request: HttpRequest, article_id: int) -> HttpResponse:
     article = ArticleDAO.get_article_by_id(article_id, prefetch_categories=True)
 
     if request.user.id != article.author.id:
         return redirect("home")
 
+    upload_error = None
     if request.method == "POST":
         title = request.POST.get("title", "").strip()
         content = request.POST.get("content", "").strip()
         source = request.POST.get("link", "").strip()
         category_ids = request.POST.getlist("cats")
         image = request.FILES.get("file")
+        upload_error = request.upload_errors.get("file")
 
-        if all([title, content, source, category_ids]):
+        if upload_error:
+            # Показать введенный текст, а не сохраненный
+            article.title, article.content, article.source = title, content, source
+        elif all([title, content, source, category_ids]):
             ArticleDAO.update_article(
                 article_id=article_id,
                 title=title,
@@ -136,6 +190,7 @@ def update_article(request: HttpRequest, article_id: int) -> HttpResponse:
         "article": article,
         "categories": categories,
         "current_category_ids": current_category_ids,
+        "upload_error": upload_error,
     }
 
     return render(request, "articles/update_article.html", context=context)
@@ -152,7 +207,11 @@ def delete_article(request: HttpRequest, article_id: int) -> HttpResponse:
     return redirect("home")
 
 
-def category(request: HttpRequest, category_slug: str) -> HttpResponse:
+@condition(etag_func=conditional.category_etag)
+# Любое изменение статьи или ее категорий сбрасывает тег "feed"
+@anonymous_page_cache(tags=lambda request, category_slug: ["feed"])
+@query_budget(8)
+async def category(request: HttpRequest, category_slug: str) -> HttpResponse:
     page = request.GET.get("page", 1)
 
     try:
@@ -160,22 +219,22 @@ def category(request: HttpRequest, category_slug: str) -> HttpResponse:
     except ValueError:
         page = 1
 
-    articles_data = ArticleDAO.get_articles_by_category(
-        category_slug=category_slug, page=page
+    articles_data = await ArticleDAO.aget_articles_by_category(
+        category_slug=category_slug, page=page, count_strategy="estimated"
+    )
+    add_cache_tags(
+        request,
+        f"category:{articles_data['category'].id}",
+        *article_tags(articles_data["articles"]),
     )
 
-    for article in articles_data["articles"]:
-        if hasattr(article, "content") and article.content:
-            article.html_content = markdown.markdown(article.content)
-        else:
-            article.html_content = None
-
-    return render(request, "articles/category.html", context=articles_data)
+    return await _arender(request, "articles/category.html", articles_data)
 
 
-def search(request: HttpRequest) -> HttpResponse:
+@query_budget(7)
+async def search(request: HttpRequest) -> HttpResponse:
     query = request.GET.get("query", "")
-    sort = request.GET.get("sort", "-created_at")
+    sort = request.GET.get("sort")
     category_slug = request.GET.get("category")
     page = request.GET.get("page", 1)
 
@@ -184,17 +243,28 @@ def search(request: HttpRequest) -> HttpResponse:
     except ValueError:
         page = 1
 
-    articles_data = ArticleDAO.search_articles(
-        query=query, page=page, per_page=10, order_by=sort, category_slug=category_slug
+    try:
+        sort = resolve_sort(sort, SEARCH_SORT_MODES)
+    except ValueError as error:
+        raise BadRequest(error)
+
+    articles_data = await ArticleDAO.asearch_articles(
+        query=query,
+        page=page,
+        per_page=10,
+        order_by=sort,
+        category_slug=category_slug,
+        count_strategy="cached",
     )
 
-    for article in articles_data["articles"]:
-        if hasattr(article, "content") and article.content:
-            article.html_content = markdown.markdown(article.content)
-        else:
-            article.html_content = None
+    return await _arender(request, "articles/search.html", articles_data)
+
 
-    return render(request, "articles/search.html", context=articles_data)
+@cache_control(public=True, max_age=60)
+@query_budget(3)
+def suggest(request: HttpRequest) -> JsonResponse:
+    query = request.GET.get("q", "")
+    return JsonResponse({"query": query, "suggestions": autocomplete.suggest(query)})
 
 
 def page_not_found_view(request: HttpRequest, exception) -> HttpResponse:
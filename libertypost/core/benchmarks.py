@@ -0,0 +1,210 @@
+"""
+Общие инструменты для команд-бенчмарков (bench_*).
+
+Бенчмарки запускаются на отдельной тестовой базе данных, которая создается
+и удаляется автоматически, и с отдельным кешем в памяти процесса, поэтому
+рабочие данные и общий кеш (страницы, сессии, счетчики входа) не затрагиваются.
+"""
+
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+LOREM = (
+    "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua котики собаки новости технологии "
+    "спорт политика экономика наука культура путешествия"
+).split()
+
+
+# Кеш бенчмарков: страницы и счетчики из тестовой базы не должны попасть
+# в общий кеш под рабочими ключами, а cache.clear() - стереть его
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "libertypost-benchmark",
+        "KEY_PREFIX": "benchmark",
+    }
+}
+
+
+def isolated_cache():
+    """
+    Заменить кеш на отдельный кеш в памяти процесса до конца блока
+    """
+    return override_settings(CACHES=BENCHMARK_CACHES)
+
+
+@contextmanager
+def benchmark_database(verbosity: int = 0):
+    """
+    Создать временную тестовую базу данных с примененными миграциями
+    и отдельным кешем и удалить ее после завершения блока
+    """
+    old_name = connection.settings_dict["NAME"]
+    with isolated_cache():
+        connection.creation.create_test_db(
+            verbosity=verbosity, autoclobber=True, serialize=False
+        )
+        try:
+            yield connection
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+
+
+def fake_text(words: int) -> str:
+    return " ".join(random.choice(LOREM) for _ in range(words))
+
+
+def seed_dataset(
+    authors: int = 200,
+    categories: int = 20,
+    articles: int = 20_000,
+    comments: int = 100_000,
+    batch_size: int = 2_000,
+) -> Dict[str, List[int]]:
+    """
+    Заполнить базу синтетическими пользователями, категориями, статьями и комментариями
+
+    Returns:
+        Словарь с ID созданных объектов по типам
+    """
+    from account.models import User
+    from articles.dao import ArticleDAO, UserDAO
+    from articles.models import Article, Category, Comment
+    from articles.search import get_search_backend
+
+    users = User.objects.bulk_create(
+        [
+            User(username=f"bench-author-{i}", email=f"author{i}@example.com")
+            for i in range(authors)
+        ],
+        batch_size=batch_size,
+    )
+    user_ids = [user.id for user in users]
+
+    category_objects = Category.objects.bulk_create(
+        [Category(name=f"Категория {i}", slug=f"bench-{i}") for i in range(categories)]
+    )
+    category_ids = [category.id for category in category_objects]
+
+    statuses = ["published"] * 8 + ["moderated", "rejected"]
+    article_ids = []
+    for start in range(0, articles, batch_size):
+        batch = []
+        for _ in range(start, min(start + batch_size, articles)):
+            content = fake_text(200)
+            batch.append(
+                Article(
+                    author_id=random.choice(user_ids),
+                    title=fake_text(6),
+                    content=content,
+                    content_html=f"<p>{content}</p>",
+                    excerpt_html=f"<p>{content[:600]}</p>",
+                    status=random.choice(statuses),
+                    source="https://example.com",
+                )
+            )
+        article_ids.extend(article.id for article in Article.objects.bulk_create(batch))
+
+    links = [
+        Article.categories.through(article_id=article_id, category_id=category_id)
+        for article_id in article_ids
+        for category_id in random.sample(category_ids, 2)
+    ]
+    Article.categories.through.objects.bulk_create(links, batch_size=batch_size)
+
+    # Комментарии распределены неравномерно: часть статей получает большинство
+    hot_articles = article_ids[: max(1, len(article_ids) // 100)]
+    for start in range(0, comments, batch_size):
+        Comment.objects.bulk_create(
+            [
+                Comment(
+                    article_id=random.choice(
+                        hot_articles if random.random() < 0.5 else article_ids
+                    ),
+                    author_id=random.choice(user_ids),
+                    content=fake_text(20),
+                )
+                for _ in range(start, min(start + batch_size, comments))
+            ]
+        )
+
+    ArticleDAO.reconcile_comment_counts()
+    UserDAO.rebuild_author_stats()
+    get_search_backend(connection.alias).rebuild()
+    analyze_database()
+
+    return {
+        "users": user_ids,
+        "categories": category_ids,
+        "articles": article_ids,
+        "hot_articles": hot_articles,
+    }
+
+
+def analyze_database() -> None:
+    """
+    Обновить статистику планировщика после массовой вставки
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def measure(
+    func: Callable, repeat: int = 5, setup: Optional[Callable] = None
+) -> Dict[str, float]:
+    """
+    Замерить время выполнения функции и количество SQL-запросов
+
+    Args:
+        func: Замеряемая функция
+        repeat: Количество повторов
+        setup: Функция, которая выполняется перед каждым повтором вне замера
+
+    Returns:
+        Словарь с медианным и минимальным временем (мс) и числом запросов
+    """
+    timings = []
+    queries = 0
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = len(context.captured_queries)
+
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "queries": queries,
+    }
+
+
+def explain(func: Callable) -> List[Dict[str, str]]:
+    """
+    Выполнить функцию и получить планы всех выполненных ею SELECT-запросов
+    """
+    with CaptureQueriesContext(connection) as context:
+        func()
+
+    plans = []
+    prefix = connection.ops.explain_query_prefix()
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            cursor.execute(f"{prefix} {sql}")
+            plan = "\n".join(" ".join(str(col) for col in row) for row in cursor)
+            plans.append({"sql": sql, "plan": plan})
+
+    return plans
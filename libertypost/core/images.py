@@ -0,0 +1,259 @@
+"""
+Производные изображения (уменьшенные копии) для изображений статей и аватарок.
+
+После сохранения модели с новым изображением сигнал ставит задачу в пул потоков
+процесса (schedule_variants), задача сохраняет уменьшенные копии в WebP и в
+исходном формате (JPEG, либо PNG для изображений с прозрачностью) и записывает
+их в поле image_variants модели:
+
+    {"source": "articles/images/a.jpg",
+     "card": {"width": 720, "height": 405, "webp": "...", "fallback": "..."}, ...}
+
+Шаблоны выводят их через тег {% picture %} (core/templatetags/images.py).
+Пока копий нет или они построены для другого файла, выводится оригинал.
+Задачи, потерянные при перезапуске процесса, досоздает команда build_image_variants.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from io import BytesIO
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """
+    Размер производного изображения. square - обрезать до квадрата (аватарки)
+    """
+
+    width: int
+    square: bool = False
+
+
+# Ширина карточки в ленте - 45rem, страница статьи - та же ширина для экранов 2x
+ARTICLE_IMAGE_VARIANTS = {
+    "card": ImageVariant(720),
+    "detail": ImageVariant(1440),
+}
+
+# Аватарки выводятся размером 2rem и 3rem
+AVATAR_VARIANTS = {
+    "avatar32": ImageVariant(32, square=True),
+    "avatar64": ImageVariant(64, square=True),
+}
+
+VARIANTS_DIR = "variants"
+
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_VARIANT_WORKERS,
+                thread_name_prefix="image-variants",
+            )
+    return _executor
+
+
+def variant_name(source_name: str, variant: str, extension: str) -> str:
+    """
+    Путь производного изображения в хранилище
+
+    Args:
+        source_name: Путь исходного изображения
+        variant: Название размера ("card", "avatar32"...)
+        extension: Расширение файла без точки
+
+    Returns:
+        Путь вида variants/<путь исходного файла без расширения>.<размер>.<расширение>
+    """
+    stem = os.path.splitext(source_name)[0]
+    return f"{VARIANTS_DIR}/{stem}.{variant}.{extension}"
+
+
+def _resize(image: Image.Image, spec: ImageVariant) -> Image.Image:
+    if spec.square:
+        size = min(spec.width, image.width, image.height)
+        return ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+
+    if image.width <= spec.width:
+        return image.copy()
+    height = round(image.height * spec.width / image.width)
+    return image.resize((spec.width, height), Image.Resampling.LANCZOS)
+
+
+def _encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = BytesIO()
+    if image_format == "WEBP":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    elif image_format == "JPEG":
+        image.convert("RGB").save(
+            buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True
+        )
+    else:
+        image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def build_variants(field_file, variants: Dict[str, ImageVariant]) -> Dict[str, Any]:
+    """
+    Построить и сохранить производные изображения. Уже существующие файлы
+    (например, общая аватарка по умолчанию) не пересоздаются.
+
+    Args:
+        field_file: Значение поля ImageField
+        variants: Размеры {название: ImageVariant}
+
+    Returns:
+        Значение для поля image_variants
+    """
+    storage = field_file.storage
+    source_name = field_file.name
+
+    with field_file.open("rb"), Image.open(field_file) as original:
+        # Для JPEG декодер сразу уменьшает изображение до ближайшего масштаба
+        largest = max(spec.width for spec in variants.values())
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA") or (
+            image.mode == "P" and "transparency" in image.info
+        )
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        fallback_format, fallback_extension = (
+            ("PNG", "png") if has_alpha else ("JPEG", "jpg")
+        )
+        formats = [("fallback", fallback_format, fallback_extension)]
+        if features.check("webp"):
+            formats.append(("webp", "WEBP", "webp"))
+
+        result: Dict[str, Any] = {"source": source_name}
+        built: Dict[tuple, Dict[str, Any]] = {}
+        for name, spec in sorted(variants.items(), key=lambda item: item[1].width):
+            resized = _resize(image, spec)
+            size = (resized.width, resized.height)
+            # Исходник меньше нескольких размеров - копия одна на все
+            if size in built:
+                result[name] = built[size]
+                continue
+
+            entry = {"width": resized.width, "height": resized.height}
+            for key, image_format, extension in formats:
+                path = variant_name(source_name, name, extension)
+                if not storage.exists(path):
+                    path = storage.save(
+                        path, ContentFile(_encode(resized, image_format))
+                    )
+                entry[key] = path
+            result[name] = built[size] = entry
+
+    return result
+
+
+def generate_variants(instance, field_name: str, variants: Dict[str, ImageVariant]):
+    """
+    Построить производные изображения для поля модели и сохранить их
+    в instance.image_variants. Сохранение вызывает обычные сигналы модели,
+    поэтому кеши страниц сбрасываются так же, как при редактировании.
+
+    Args:
+        instance: Объект модели с полем image_variants
+        field_name: Имя поля ImageField
+        variants: Размеры {название: ImageVariant}
+
+    Returns:
+        True, если производные изображения были обновлены
+
+    Raises:
+        OSError, ValueError: Файл не найден или не является изображением
+        (image_variants сохраняется без копий, чтобы не повторять попытку
+        при каждом сохранении объекта)
+    """
+    field_file = getattr(instance, field_name)
+    error = None
+    if not field_file:
+        if not instance.image_variants:
+            return False
+        instance.image_variants = {}
+    else:
+        if instance.image_variants.get("source") == field_file.name:
+            return False
+        try:
+            instance.image_variants = build_variants(field_file, variants)
+        except (OSError, ValueError) as exc:
+            instance.image_variants = {"source": field_file.name}
+            error = exc
+
+    update_fields = ["image_variants"]
+    if any(field.name == "updated_at" for field in instance._meta.fields):
+        # Ключи кешей карточек и ETag зависят от updated_at
+        update_fields.append("updated_at")
+    instance.save(update_fields=update_fields)
+    if error is not None:
+        raise error
+    return True
+
+
+def _run_task(model, pk, field_name: str, source_name: str, variants) -> None:
+    close_old_connections()
+    try:
+        instance = model._default_manager.filter(pk=pk).first()
+        if instance is None:
+            return
+        # Изображение могли заменить, пока задача ждала в очереди
+        if (getattr(instance, field_name).name or None) == source_name:
+            generate_variants(instance, field_name, variants)
+    except (OSError, ValueError) as error:
+        logger.warning(
+            "Изображение %s #%s не обработано: %s", model._meta.label, pk, error
+        )
+    except Exception:
+        logger.exception(
+            "Не удалось построить производные изображения %s #%s",
+            model._meta.label,
+            pk,
+        )
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(instance, field_name: str, variants: Dict[str, ImageVariant]):
+    """
+    Поставить построение производных изображений в пул потоков после фиксации
+    транзакции, если image_variants построены не для текущего файла
+
+    Args:
+        instance: Сохраненный объект модели
+        field_name: Имя поля ImageField
+        variants: Размеры {название: ImageVariant}
+    """
+    field_file = getattr(instance, field_name)
+    source_name = field_file.name if field_file else None
+    if (instance.image_variants or {}).get("source") == source_name:
+        return
+
+    task = partial(
+        _run_task, type(instance), instance.pk, field_name, source_name, variants
+    )
+    if settings.IMAGE_VARIANTS_SYNC:
+        transaction.on_commit(task)
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(task))
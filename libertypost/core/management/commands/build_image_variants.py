@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from account.models import User
+from articles.models import Article
+from core.images import ARTICLE_IMAGE_VARIANTS, AVATAR_VARIANTS, generate_variants
+
+
+class Command(BaseCommand):
+    """
+    Команда для построения уменьшенных копий изображений статей и аватарок,
+    у которых их нет (загруженных до появления копий или потерянных задач
+    фонового пула при перезапуске процесса). Выполняется синхронно.
+    """
+
+    help = "Построить недостающие уменьшенные копии изображений"
+
+    def handle(self, *args, **options):
+        targets = [
+            ("статей", Article, ARTICLE_IMAGE_VARIANTS),
+            ("аватарок", User, AVATAR_VARIANTS),
+        ]
+        for label, model, variants in targets:
+            built = failed = 0
+            queryset = (
+                model.objects.exclude(image="").exclude(image=None).order_by("pk")
+            )
+
+            for instance in queryset.iterator(chunk_size=200):
+                try:
+                    built += generate_variants(instance, "image", variants)
+                except (OSError, ValueError) as error:
+                    failed += 1
+                    self.stderr.write(f"{model._meta.label} #{instance.pk}: {error}")
+
+            self.stdout.write(
+                self.style.SUCCESS(f"Изображений {label}: построено {built}")
+                + (f", ошибок {failed}" if failed else "")
+            )
@@ -0,0 +1,79 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from account.avatars import AVATARS_DIR
+from core.storage import media_references
+
+
+class Command(BaseCommand):
+    """
+    Команда для удаления медиафайлов, на которые не ссылаются Article.image,
+    User.image и их image_variants (замененные изображения, копии удаленных
+    статей, брошенные временные файлы загрузок). Аватарки по умолчанию
+    (файлы в корне MEDIA_ROOT/avatars) не удаляются. Файлы моложе --min-age
+    пропускаются: загрузка могла записать файл, но еще не сохранить объект.
+    """
+
+    help = "Удалить медиафайлы без ссылок из базы данных"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать файлы, которые будут удалены",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=3600,
+            help="Минимальный возраст удаляемого файла, секунд",
+        )
+
+    def handle(self, *args, **options):
+        media_root = os.path.abspath(settings.MEDIA_ROOT)
+        references = media_references()
+        cutoff = time.time() - options["min_age"]
+
+        removed = kept = freed = 0
+        for name, path in self._files(media_root):
+            if name in references:
+                kept += 1
+                continue
+
+            stat = os.stat(path)
+            if stat.st_mtime > cutoff:
+                kept += 1
+                continue
+
+            if options["verbosity"] > 1 or options["dry_run"]:
+                self.stdout.write(name)
+            if not options["dry_run"]:
+                os.remove(path)
+            removed += 1
+            freed += stat.st_size
+
+        action = "Будет удалено" if options["dry_run"] else "Удалено"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} файлов: {removed} ({filesizeformat(freed)}), "
+                f"оставлено: {kept}, ссылок в базе: {len(references)}"
+            )
+        )
+
+    @staticmethod
+    def _files(media_root: str):
+        """
+        Файлы MEDIA_ROOT, которые могут быть удалены: (имя в хранилище, путь)
+        """
+        default_avatars = os.path.join(media_root, AVATARS_DIR)
+        for directory, _, filenames in os.walk(media_root):
+            if directory == default_avatars:
+                continue
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, media_root).replace(os.sep, "/")
+                yield name, path
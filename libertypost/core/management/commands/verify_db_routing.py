@@ -0,0 +1,198 @@
+from contextlib import ExitStack
+from typing import Callable, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from core.benchmarks import isolated_cache
+from libertypost.routers import PRIMARY_PIN_COOKIE_NAME, routing_state
+
+
+class Command(BaseCommand):
+    """
+    Проверка маршрутизации между основной базой и репликами (libertypost.routers).
+    Запускается с настроенными репликами, например для двух баз SQLite:
+        DB_REPLICAS=/tmp/replica.sqlite3 python manage.py verify_db_routing
+    Команда создает временные тестовые базы (реплика - зеркало основной)
+    и использует отдельный кеш, рабочие данные не затрагиваются.
+    """
+
+    help = "Проверить, что чтения идут на реплики, а записи - в основную базу"
+
+    def handle(self, *args, **options):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            raise CommandError(
+                "Реплики не настроены: задайте DB_REPLICAS (см. .env.example)"
+            )
+
+        setup_test_environment()
+        with isolated_cache():
+            old_config = setup_databases(
+                verbosity=0, interactive=False, aliases={DEFAULT_DB_ALIAS, *replicas}
+            )
+            try:
+                results = self._run(replicas)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+
+        failed = 0
+        for name, ok, details in results:
+            status = self.style.SUCCESS("OK") if ok else self.style.ERROR("ОШИБКА")
+            self.stdout.write(f"{status:<6} {name}: {details}")
+            failed += not ok
+
+        if failed:
+            raise CommandError(f"Не пройдено проверок: {failed}")
+
+    @staticmethod
+    def _queries(aliases: List[str], func: Callable) -> Dict[str, List[str]]:
+        """
+        Выполнить func и вернуть SQL-запросы к таблицам приложений по базам
+        """
+        with ExitStack() as stack:
+            contexts = {
+                alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in aliases
+            }
+            func()
+
+        return {
+            alias: [
+                query["sql"]
+                for query in context.captured_queries
+                if "articles_" in query["sql"] or "account_" in query["sql"]
+            ]
+            for alias, context in contexts.items()
+        }
+
+    @staticmethod
+    def _summary(queries: Dict[str, List[str]]) -> str:
+        return ", ".join(f"{alias}: {len(sql)}" for alias, sql in queries.items())
+
+    def _run(self, replicas: List[str]):
+        from account.models import User
+        from articles.dao import ArticleDAO
+        from articles.models import Category
+
+        aliases = [DEFAULT_DB_ALIAS, *replicas]
+
+        def on_primary(queries) -> bool:
+            replica_queries = any(queries[alias] for alias in replicas)
+            return bool(queries[DEFAULT_DB_ALIAS]) and not replica_queries
+
+        def on_replica(queries) -> bool:
+            replica_queries = any(queries[alias] for alias in replicas)
+            return not queries[DEFAULT_DB_ALIAS] and replica_queries
+
+        author = User.objects.create_user("routing-author", "author@example.com", "pw")
+        category = Category.objects.create(name="Маршрутизация", slug="routing")
+        article = ArticleDAO.create_article(
+            author_id=author.id,
+            title="Статья",
+            content="Текст",
+            source="https://example.com",
+            category_ids=[category.id],
+            status="published",
+        )
+        cache.clear()
+        results = []
+
+        def read_articles():
+            list(ArticleDAO.get_articles_with_comment_count()["articles"])
+
+        queries = self._queries(aliases, read_articles)
+        results.append(
+            ("чтение вне веб-запроса", on_primary(queries), self._summary(queries))
+        )
+
+        def read_in_request():
+            with routing_state():
+                read_articles()
+
+        queries = self._queries(aliases, read_in_request)
+        results.append(
+            ("чтение в веб-запросе", on_replica(queries), self._summary(queries))
+        )
+
+        client = Client(HTTP_HOST="localhost")
+        url = reverse("articles:article", args=[article.id])
+
+        queries = self._queries(aliases, lambda: client.get(url))
+        results.append(
+            ("страница статьи (аноним)", on_replica(queries), self._summary(queries))
+        )
+
+        client.force_login(author)
+        client.cookies.pop(PRIMARY_PIN_COOKIE_NAME, None)
+        response = {}
+
+        def post_comment():
+            response["value"] = client.post(url, {"comment": "Свой комментарий"})
+
+        queries = self._queries(aliases, post_comment)
+        pinned = PRIMARY_PIN_COOKIE_NAME in response["value"].cookies
+        results.append(
+            (
+                "комментарий: запись в основную базу и cookie",
+                on_primary(queries) and pinned,
+                f"{self._summary(queries)}, cookie: {pinned}",
+            )
+        )
+
+        queries = self._queries(aliases, lambda: client.get(url))
+        results.append(
+            (
+                "страница статьи после записи",
+                on_primary(queries),
+                self._summary(queries),
+            )
+        )
+
+        client.cookies.pop(PRIMARY_PIN_COOKIE_NAME, None)
+        queries = self._queries(aliases, lambda: client.get(url))
+        results.append(
+            (
+                "страница статьи после окна закрепления",
+                on_replica(queries),
+                self._summary(queries),
+            )
+        )
+
+        anonymous = Client(HTTP_HOST="localhost")
+
+        def register():
+            response["value"] = anonymous.post(
+                reverse("account:register"),
+                {
+                    "email": "reader@example.com",
+                    "username": "routing-reader",
+                    "password1": "Routing-Pass-123",
+                    "password2": "Routing-Pass-123",
+                },
+            )
+
+        queries = self._queries(aliases, register)
+        registered = User.objects.filter(username="routing-reader").exists()
+        pinned = PRIMARY_PIN_COOKIE_NAME in response["value"].cookies
+        results.append(
+            (
+                "регистрация: запись в основную базу и cookie",
+                on_primary(queries) and registered and pinned,
+                f"{self._summary(queries)}, cookie: {pinned}",
+            )
+        )
+
+        return results
@@ -0,0 +1,144 @@
+"""
+Хранилище медиафайлов с адресацией по содержимому.
+
+Загруженный файл сохраняется под именем из SHA-256 его содержимого:
+articles/images/ab/ab12...ef.jpg (каталог upload_to, первые два символа хеша,
+хеш и расширение). Одинаковые загрузки (повторная загрузка того же изображения
+при редактировании статьи, одна аватарка у нескольких пользователей) хранятся
+одним файлом. Содержимое файла с таким именем никогда не меняется, поэтому
+nginx отдает их с Cache-Control: immutable.
+
+Уменьшенные копии (каталог variants) сохраняются под именами, построенными
+от имени исходного файла (см. core.images.variant_name), чтобы повторная
+сборка находила уже созданные копии.
+
+Файлы не удаляются при удалении или замене изображения, так как на них могут
+ссылаться другие объекты. Файлы без ссылок удаляет команда gc_media
+(ссылки считает media_references).
+"""
+
+import hashlib
+import os
+import re
+from collections import Counter
+from typing import Set
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+from .images import VARIANTS_DIR
+from .uploads import SIGNATURE_LENGTH, detect_image_format
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Расширение файла по формату изображения: одинаковые файлы с именами
+# photo.JPG и photo.jpeg хранятся одним файлом с расширением .jpg
+IMAGE_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "GIF": ".gif", "WEBP": ".webp"}
+
+# Имя файла, построенное ContentAddressedStorage, или производное от него
+# (уменьшенные копии: variants/articles/images/ab/ab12...ef.card.jpg)
+CONTENT_ADDRESSED_NAME = re.compile(r"(?:^|/)[0-9a-f]{2}/[0-9a-f]{64}(?:\.\w+)*$")
+
+
+def content_extension(name: str, content) -> str:
+    """
+    Расширение файла по его формату (первые байты содержимого), а для
+    неизвестных форматов - расширение исходного имени в нижнем регистре
+    """
+    content.seek(0)
+    head = content.read(SIGNATURE_LENGTH)
+    content.seek(0)
+    image_format = detect_image_format(head)
+    if image_format is not None:
+        return IMAGE_EXTENSIONS[image_format]
+    return os.path.splitext(name)[1].lower()
+
+
+def content_hash(content) -> str:
+    """
+    SHA-256 содержимого файла (файл читается частями и перематывается в начало)
+    """
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, которое называет файлы по хешу содержимого
+    и не сохраняет повторно уже существующие файлы
+    """
+
+    def hashed_name(self, name: str, content) -> str:
+        """
+        Имя файла по содержимому
+
+        Args:
+            name: Имя, предложенное полем (каталог upload_to и исходное имя)
+            content: Содержимое файла
+
+        Returns:
+            Путь вида <каталог>/<2 символа хеша>/<хеш>.<расширение формата>
+        """
+        directory = os.path.dirname(name)
+        extension = content_extension(name, content)
+        digest = content_hash(content)
+        return "/".join(
+            part for part in (directory, digest[:2], digest + extension) if part
+        )
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        # Имена копий уже определяются исходным файлом: его хешем или, для
+        # аватарок по умолчанию и старых загрузок, его путем
+        if not CONTENT_ADDRESSED_NAME.search(name) and not name.startswith(
+            f"{VARIANTS_DIR}/"
+        ):
+            name = self.hashed_name(name, content)
+        if self.exists(name):
+            # Такое содержимое уже загружено
+            return name
+        return super().save(name, content, max_length)
+
+
+def media_references() -> Counter:
+    """
+    Количество ссылок на каждый медиафайл из Article.image и User.image,
+    включая уменьшенные копии из image_variants
+
+    Returns:
+        Счетчик {путь относительно MEDIA_ROOT: количество ссылок}
+    """
+    from account.models import User
+    from articles.models import Article
+
+    references = Counter()
+    for model in (Article, User):
+        rows = (
+            model.objects.exclude(image="")
+            .exclude(image=None)
+            .values_list("image", "image_variants")
+        )
+        for image, variants in rows.iterator(chunk_size=2000):
+            # Имена из базы, созданной под Windows, записаны через "\\"
+            references[image.replace("\\", "/")] += 1
+            references.update(_variant_paths(variants or {}))
+    return references
+
+
+def _variant_paths(variants: dict) -> Set[str]:
+    # Одна копия может соответствовать нескольким размерам
+    return {
+        path
+        for key, entry in variants.items()
+        if key != "source" and isinstance(entry, dict)
+        for path in (entry.get("fallback"), entry.get("webp"))
+        if path
+    }
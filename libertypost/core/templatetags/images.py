@@ -0,0 +1,91 @@
+from django import template
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+def _srcset(storage, variants, key: str) -> str:
+    return ", ".join(
+        f"{storage.url(variant[key])} {variant['width']}w" for variant in variants
+    )
+
+
+@register.simple_tag
+def picture(
+    field_file,
+    variants=None,
+    sizes="100vw",
+    alt="",
+    css_class="",
+    fallback="",
+    loading="lazy",
+):
+    """
+    Вывести изображение с уменьшенными копиями (core/images.py): <picture>
+    с WebP и <img> в исходном формате, браузер выбирает размер по sizes
+
+    Args:
+        field_file: Значение поля ImageField
+        variants: Значение поля image_variants той же модели
+        sizes: Ширина изображения на странице (атрибут sizes)
+        alt: Альтернативный текст
+        css_class: CSS-класс тега <img>
+        fallback: Адрес изображения, если поле пустое
+        loading: "eager" для изображений в первом экране страницы
+
+    Returns:
+        HTML-разметка изображения
+    """
+    class_attr = format_html(' class="{}"', css_class) if css_class else ""
+
+    if not field_file:
+        if not fallback:
+            return ""
+        return format_html('<img{} src="{}" alt="{}" />', class_attr, fallback, alt)
+
+    # Одна копия может соответствовать нескольким размерам
+    variants = variants or {}
+    entries = sorted(
+        {
+            value["fallback"]: value
+            for key, value in variants.items()
+            if key != "source"
+        }.values(),
+        key=lambda entry: entry["width"],
+    )
+
+    # Копии еще не построены, построены для прежнего файла или не удались
+    if variants.get("source") != field_file.name or not entries:
+        return format_html(
+            '<img{} src="{}" alt="{}" loading="{}" decoding="async" />',
+            class_attr,
+            field_file.url,
+            alt,
+            loading,
+        )
+
+    storage = field_file.storage
+    # src - для браузеров без поддержки srcset
+    largest = entries[-1]
+
+    sources = ""
+    if all("webp" in entry for entry in entries):
+        sources = format_html(
+            '<source type="image/webp" srcset="{}" sizes="{}" />',
+            _srcset(storage, entries, "webp"),
+            sizes,
+        )
+
+    image = format_html(
+        '<img{} src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" '
+        'loading="{}" decoding="async" />',
+        class_attr,
+        storage.url(largest["fallback"]),
+        _srcset(storage, entries, "fallback"),
+        sizes,
+        largest["width"],
+        largest["height"],
+        alt,
+        loading,
+    )
+    return format_html("<picture>{}{}</picture>", sources, image)
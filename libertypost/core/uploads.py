@@ -0,0 +1,138 @@
+"""
+Потоковая загрузка изображений с проверкой на лету.
+
+ValidatingImageUploadHandler пишет загружаемый файл частями во временный файл
+в FILE_UPLOAD_TEMP_DIR и отклоняет его, не дочитывая тело запроса до конца:
+- по первым байтам, если это не JPEG, PNG, GIF или WebP;
+- как только размер превысил IMAGE_UPLOAD_MAX_SIZE;
+- по размерам в пикселях из заголовка (Pillow читает заголовок без
+  декодирования), если изображение больше IMAGE_UPLOAD_MAX_PIXELS.
+
+Отклоненный файл не попадает в request.FILES, причина записывается
+в request.upload_errors. Временный каталог находится на том же диске, что
+и MEDIA_ROOT, поэтому хранилище переносит принятый файл переименованием,
+без копирования.
+"""
+
+from io import BytesIO
+from typing import Optional
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, UnidentifiedImageError
+
+# Сигнатуры поддерживаемых форматов: (смещение, байты)
+IMAGE_SIGNATURES = {
+    "JPEG": [(0, b"\xff\xd8\xff")],
+    "PNG": [(0, b"\x89PNG\r\n\x1a\n")],
+    "GIF": [(0, b"GIF87a"), (0, b"GIF89a")],
+    "WEBP": [(0, b"RIFF"), (8, b"WEBP")],
+}
+
+# Сколько байт заголовка нужно для определения формата и размеров
+SIGNATURE_LENGTH = 12
+HEADER_MAX_LENGTH = 256 * 1024
+
+
+def detect_image_format(head: bytes) -> Optional[str]:
+    """
+    Определить формат изображения по первым байтам файла
+
+    Args:
+        head: Начало файла (не меньше SIGNATURE_LENGTH байт)
+
+    Returns:
+        Название формата Pillow или None, если формат не поддерживается
+    """
+    for image_format, signatures in IMAGE_SIGNATURES.items():
+        if all(
+            head[offset : offset + len(signature)] == signature
+            for offset, signature in signatures
+        ):
+            return image_format
+    return None
+
+
+def read_image_size(head: bytes) -> Optional[tuple]:
+    """
+    Прочитать размеры изображения из заголовка без декодирования пикселей
+
+    Returns:
+        (ширина, высота) или None, если заголовок еще не получен целиком
+    """
+    try:
+        with Image.open(BytesIO(head)) as image:
+            return image.size
+    except (UnidentifiedImageError, OSError, SyntaxError, EOFError):
+        return None
+
+
+class ValidatingImageUploadHandler(TemporaryFileUploadHandler):
+    """
+    Обработчик загрузки, который принимает только изображения допустимого
+    размера и пишет их во временный файл частями
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        if request is not None and not hasattr(request, "upload_errors"):
+            request.upload_errors = {}
+        self.head = b""
+        self.size = 0
+        self.checked = False
+
+    def _reject(self, message: str):
+        # Временный файл закрывает (и тем самым удаляет) MultiPartParser,
+        # остаток файла в теле запроса пропускается без записи
+        if self.request is not None:
+            self.request.upload_errors[self.field_name] = message
+        raise SkipFile(message)
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.head = b""
+        self.size = 0
+        self.checked = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > settings.IMAGE_UPLOAD_MAX_SIZE:
+            limit = filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)
+            self._reject(f"Изображение больше {limit}")
+
+        if not self.checked and len(self.head) < HEADER_MAX_LENGTH:
+            self.head += raw_data[: HEADER_MAX_LENGTH - len(self.head)]
+            self._check_header()
+
+        return super().receive_data_chunk(raw_data, start)
+
+    def _check_header(self, complete: bool = False):
+        if len(self.head) < SIGNATURE_LENGTH and not complete:
+            return
+        if detect_image_format(self.head) is None:
+            self._reject("Файл не является изображением JPEG, PNG, GIF или WebP")
+
+        try:
+            size = read_image_size(self.head)
+        except Image.DecompressionBombError:
+            self._reject("Изображение слишком большое")
+        if size is None:
+            if complete or len(self.head) >= HEADER_MAX_LENGTH:
+                self._reject("Не удалось прочитать размеры изображения")
+            return
+
+        self.checked = True
+        width, height = size
+        if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+            self._reject(f"Изображение слишком большое: {width}x{height} пикселей")
+
+    def file_complete(self, file_size):
+        if not self.checked:
+            # Файл меньше заголовка, который нужен для проверки
+            try:
+                self._check_header(complete=True)
+            except SkipFile:
+                self.file.close()
+                return None
+        return super().file_complete(file_size)
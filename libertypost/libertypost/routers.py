@@ -0,0 +1,156 @@
+"""
+Маршрутизация запросов к базе данных между основной базой и репликами для чтения.
+
+Реплики задаются переменной окружения DB_REPLICAS (см. settings.DATABASE_REPLICAS).
+На реплики идут только чтения внутри веб-запросов (PrimaryPinningMiddleware):
+команды manage.py, миграции и shell работают с основной базой, чтобы
+пересчеты счетчиков не читали отстающие данные.
+
+Реплика отстает от основной базы, поэтому чтения идут в основную базу, если:
+- запрос изменяющий (POST и т.п.) или внутри открытой транзакции;
+- пользователь недавно что-то записал: после записи ответ ставит cookie
+  на DB_REPLICA_PIN_SECONDS секунд, и автор сразу видит свою статью и комментарий;
+- модель хранит служебные данные (сессии, кеш в базе данных).
+
+Общие кеши, заполненные с отстающей реплики сразу после записи, сбрасываются
+повторным увеличением версий через DB_REPLICA_PIN_SECONDS секунд
+(см. articles.cache.bump_version).
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Cookie, которая закрепляет чтения пользователя за основной базой
+PRIMARY_PIN_COOKIE_NAME = "db_primary"
+
+# Приложения, которые всегда читаются из основной базы
+# (django_cache - таблица DatabaseCache)
+PRIMARY_ONLY_APPS = {"sessions", "django_cache"}
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RoutingState:
+    """
+    Состояние маршрутизации текущего веб-запроса
+    """
+
+    def __init__(self, pinned: bool = False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_routing_state: ContextVar[Optional[RoutingState]] = ContextVar(
+    "db_routing_state", default=None
+)
+
+
+@contextmanager
+def routing_state(pinned: bool = False) -> Iterator[RoutingState]:
+    """
+    Разрешить чтение с реплик внутри блока (как в веб-запросе)
+
+    Args:
+        pinned: Читать из основной базы (пользователь недавно писал)
+
+    Returns:
+        Состояние, в котором отмечается, была ли запись в основную базу
+    """
+    state = RoutingState(pinned=pinned)
+    token = _routing_state.set(state)
+    try:
+        yield state
+    finally:
+        _routing_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Запись - в основную базу, чтение - на случайную реплику, если это безопасно
+    """
+
+    def db_for_read(self, model, **hints) -> str:
+        replicas = settings.DATABASE_REPLICAS
+        state = _routing_state.get()
+        if (
+            not replicas
+            or state is None
+            or state.pinned
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+
+        # Связанные объекты записанной или прочитанной из основной базы модели
+        # читаются оттуда же
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db == DEFAULT_DB_ALIAS:
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints) -> str:
+        state = _routing_state.get()
+        if state is not None and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Реплики содержат те же данные, что и основная база
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        return db == DEFAULT_DB_ALIAS
+
+
+class PrimaryPinningMiddleware:
+    """
+    Промежуточное ПО, которое разрешает чтение с реплик на время запроса
+    и закрепляет чтения пользователя за основной базой после его записи
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _is_pinned(request) -> bool:
+        return (
+            request.method not in SAFE_METHODS
+            or PRIMARY_PIN_COOKIE_NAME in request.COOKIES
+        )
+
+    @staticmethod
+    def _pin(response, state: RoutingState):
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE_NAME,
+                "1",
+                max_age=settings.DB_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with routing_state(pinned=self._is_pinned(request)) as state:
+            response = self.get_response(request)
+        return self._pin(response, state)
+
+    async def __acall__(self, request):
+        with routing_state(pinned=self._is_pinned(request)) as state:
+            response = await self.get_response(request)
+        return self._pin(response, state)
@@ -10,6 +10,9 @@ SECRET_KEY = os.environ.get(
 DEBUG = os.environ.get("DEBUG", "False") == "True"
 # DEBUG = True
 
+# Проверять бюджет SQL-запросов представлений (см. articles.decorators.query_budget)
+QUERY_BUDGET_ENFORCED = os.environ.get("QUERY_BUDGET_ENFORCED", str(DEBUG)) == "True"
+
 ALLOWED_HOSTS = os.environ.get("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
 
 
@@ -28,6 +31,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "libertypost.routers.PrimaryPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -69,9 +73,78 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD", ""),
         "HOST": os.environ.get("DB_HOST", ""),
         "PORT": os.environ.get("DB_PORT", ""),
+        # Проверять переиспользуемое соединение перед первым запросом
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "True") == "True",
+    }
+}
+
+# Соединения с базой данных (переменные окружения, см. README):
+# - DB_CONN_MAX_AGE: сколько секунд соединение переиспользуется между запросами
+#   ("none" - без ограничения, 0 - новое соединение на каждый запрос). В режиме
+#   ASGI каждый запрос выполняется в своем потоке, поэтому по умолчанию 0;
+# - DB_POOL=True: пул соединений psycopg 3 на процесс (только PostgreSQL),
+#   размер задается DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE, ожидание свободного
+#   соединения - DB_POOL_TIMEOUT секунд. С пулом CONN_MAX_AGE всегда 0.
+SERVER_INTERFACE = os.environ.get("SERVER_INTERFACE") or "wsgi"
+DB_CONN_MAX_AGE = os.environ.get("DB_CONN_MAX_AGE") or (
+    "0" if SERVER_INTERFACE == "asgi" else "60"
+)
+DATABASES["default"]["CONN_MAX_AGE"] = (
+    None if DB_CONN_MAX_AGE.lower() == "none" else int(DB_CONN_MAX_AGE)
+)
+
+DB_POOL = os.environ.get("DB_POOL", "False") == "True"
+if DB_POOL and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE") or 1),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE") or 4),
+            "timeout": int(os.environ.get("DB_POOL_TIMEOUT") or 10),
+        }
+    }
+
+# Реплики для чтения (см. libertypost/routers.py): DB_REPLICAS - список через
+# запятую, для PostgreSQL элементы - HOST[:PORT] реплик (остальные параметры как
+# у основной базы), для SQLite - пути к файлам. После записи чтения пользователя
+# DB_REPLICA_PIN_SECONDS секунд идут в основную базу.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, map(str.strip, (os.environ.get("DB_REPLICAS") or "").split(",")))
+):
+    replica_settings = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    if replica_settings["ENGINE"] == "django.db.backends.sqlite3":
+        replica_settings["NAME"] = replica
+    else:
+        host, _, port = replica.partition(":")
+        replica_settings["HOST"] = host
+        replica_settings["PORT"] = port or replica_settings["PORT"]
+    DATABASES[f"replica_{number}"] = replica_settings
+    DATABASE_REPLICAS.append(f"replica_{number}")
+
+DATABASE_ROUTERS = ["libertypost.routers.PrimaryReplicaRouter"]
+DB_REPLICA_PIN_SECONDS = int(os.environ.get("DB_REPLICA_PIN_SECONDS") or 10)
+
+
+# Кеш: по умолчанию в памяти процесса. Для нескольких воркеров gunicorn
+# нужен общий бэкенд (в docker-compose.yml - Redis, требуется пакет redis)
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://redis:6379/1
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND")
+        or "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION") or "libertypost",
     }
 }
 
+# Кеш в памяти процесса не виден другим воркерам: сброс сессии при выходе
+# или пользователя при смене пароля сработал бы только в одном из них,
+# поэтому сессии и пользователи кешируются только в общем кеше
+CACHE_SHARED = not CACHES["default"]["BACKEND"].endswith(
+    (".LocMemCache", ".DummyCache")
+)
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -90,9 +163,21 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTHENTICATION_BACKENDS = [
     # "account.backends.EmailOrUsernameBackend",
-    "django.contrib.auth.backends.ModelBackend",  # Стандартный бэкенд Django
+    # Стандартный бэкенд Django с кешированием пользователя сессии
+    # (без общего кеша работает как ModelBackend)
+    "account.backends.CachedModelBackend",
+    # Сессии, созданные до включения кеширования, ссылаются на этот бэкенд
+    "django.contrib.auth.backends.ModelBackend",
 ]
 
+# Сессии читаются из кеша, записываются в кеш и в базу данных
+# (без общего кеша - только в базу данных)
+SESSION_ENGINE = os.environ.get("SESSION_ENGINE") or (
+    "django.contrib.sessions.backends.cached_db"
+    if CACHE_SHARED
+    else "django.contrib.sessions.backends.db"
+)
+
 
 LANGUAGE_CODE = "ru-RU"
 
@@ -116,6 +201,14 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "account.User"
 
+# Ограничение попыток входа (account/throttling.py): все попытки с IP-адреса
+# и неудачные попытки для логина за окно LOGIN_THROTTLE_WINDOW секунд
+LOGIN_ATTEMPTS_PER_IP = int(os.environ.get("LOGIN_ATTEMPTS_PER_IP") or 20)
+LOGIN_FAILURES_PER_USERNAME = int(os.environ.get("LOGIN_FAILURES_PER_USERNAME") or 5)
+LOGIN_THROTTLE_WINDOW = int(os.environ.get("LOGIN_THROTTLE_WINDOW") or 300)
+# Заголовок с адресом клиента за прокси, например HTTP_X_REAL_IP для nginx
+LOGIN_THROTTLE_IP_HEADER = os.environ.get("LOGIN_THROTTLE_IP_HEADER") or None
+
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "account:login"
 
@@ -123,6 +216,34 @@ LOGOUT_REDIRECT_URL = "account:login"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Загруженные файлы называются по хешу содержимого (core/storage.py)
+STORAGES = {
+    "default": {"BACKEND": "core.storage.ContentAddressedStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Как часто проверять изменение каталога аватарок по умолчанию (account/avatars.py)
+AVATAR_RESCAN_SECONDS = int(os.environ.get("AVATAR_RESCAN_SECONDS") or 60)
+
+# Загрузка изображений статей (core/uploads.py). Временные файлы пишутся
+# на тот же диск, что и MEDIA_ROOT, чтобы принятый файл переносился переименованием
+FILE_UPLOAD_TEMP_DIR = os.environ.get("FILE_UPLOAD_TEMP_DIR") or os.path.join(
+    MEDIA_ROOT, ".uploads"
+)
+IMAGE_UPLOAD_MAX_SIZE = int(os.environ.get("IMAGE_UPLOAD_MAX_SIZE") or 10 * 1024 * 1024)
+IMAGE_UPLOAD_MAX_PIXELS = int(os.environ.get("IMAGE_UPLOAD_MAX_PIXELS") or 40_000_000)
+
+# Уменьшенные копии изображений (см. core/images.py) строятся в пуле потоков
+# каждого процесса; IMAGE_VARIANTS_SYNC=True - сразу в запросе (для отладки)
+IMAGE_VARIANT_WORKERS = int(os.environ.get("IMAGE_VARIANT_WORKERS") or 2)
+IMAGE_VARIANTS_SYNC = os.environ.get("IMAGE_VARIANTS_SYNC", "False") == "True"
+
+
+# Конфигурация Markdown для статей.
+# После изменения нужно выполнить "python manage.py render_articles"
+MARKDOWN_EXTENSIONS = []
+MARKDOWN_EXTENSION_CONFIGS = {}
+
 
 JAZZMIN_SETTINGS = {
     "site_title": "LibertyPost admin",
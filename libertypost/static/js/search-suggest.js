@@ -0,0 +1,42 @@
+document.addEventListener('DOMContentLoaded', () => {
+    const input = document.querySelector('input[data-suggest-url]');
+    if (!input) {
+        return;
+    }
+
+    const datalist = document.getElementById(input.getAttribute('list'));
+    const url = input.dataset.suggestUrl;
+    let timer = null;
+    let controller = null;
+
+    function render(suggestions) {
+        datalist.innerHTML = '';
+        suggestions.forEach((suggestion) => {
+            const option = document.createElement('option');
+            option.value = suggestion.text;
+            datalist.appendChild(option);
+        });
+    }
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const query = input.value.trim();
+
+        if (query.length < 2) {
+            render([]);
+            return;
+        }
+
+        timer = setTimeout(() => {
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+
+            fetch(`${url}?q=${encodeURIComponent(query)}`, { signal: controller.signal })
+                .then((response) => response.json())
+                .then((data) => render(data.suggestions))
+                .catch(() => {});
+        }, 150);
+    });
+});